@@ -96,15 +96,13 @@ def generate_and_insert_customers(conn: sqlite3.Connection, count: int) -> List[
 
     # Insert customers
     cursor = conn.cursor()
+    customer_ids = []
     for customer in customers:
         cursor.execute(
             "INSERT INTO customers (name, email, phone) VALUES (?, ?, ?)",
             (customer["name"], customer["email"], customer["phone"]),
         )
-
-    # Get customer IDs
-    cursor.execute("SELECT customer_id FROM customers")
-    customer_ids = [row[0] for row in cursor.fetchall()]
+        customer_ids.append(cursor.lastrowid)
 
     return customer_ids
 
@@ -161,6 +159,7 @@ def generate_and_insert_addresses(conn: sqlite3.Connection, customer_ids: List[i
 
     # Insert addresses
     cursor = conn.cursor()
+    address_data = []
     for address in addresses:
         cursor.execute(
             """
@@ -180,10 +179,7 @@ def generate_and_insert_addresses(conn: sqlite3.Connection, customer_ids: List[i
                 address["is_verified"],
             ),
         )
-
-    # Get address IDs with their associated customer IDs
-    cursor.execute("SELECT address_id, customer_id FROM addresses")
-    address_data = [(row[0], row[1]) for row in cursor.fetchall()]
+        address_data.append((cursor.lastrowid, address["customer_id"]))
 
     return address_data
 
@@ -237,6 +233,7 @@ def generate_and_insert_materials(conn: sqlite3.Connection) -> List[int]:
 
     # Insert materials
     cursor = conn.cursor()
+    material_ids = []
     for material in materials:
         cursor.execute(
             "INSERT INTO materials (name, description, unit_cost, unit_type) VALUES (?, ?, ?, ?)",
@@ -247,10 +244,7 @@ def generate_and_insert_materials(conn: sqlite3.Connection) -> List[int]:
                 material["unit_type"],
             ),
         )
-
-    # Get material IDs
-    cursor.execute("SELECT material_id FROM materials")
-    material_ids = [row[0] for row in cursor.fetchall()]
+        material_ids.append(cursor.lastrowid)
 
     return material_ids
 
@@ -284,17 +278,18 @@ def generate_and_insert_inventory(conn: sqlite3.Connection, material_ids: List[i
         )
 
     # Insert inventory
-    cursor = conn.cursor()
-    for inv in inventory:
-        cursor.execute(
-            "INSERT INTO inventory (material_id, quantity, location, last_restock_date) VALUES (?, ?, ?, ?)",
+    conn.executemany(
+        "INSERT INTO inventory (material_id, quantity, location, last_restock_date) VALUES (?, ?, ?, ?)",
+        (
             (
                 inv["material_id"],
                 inv["quantity"],
                 inv["location"],
                 inv["last_restock_date"],
-            ),
-        )
+            )
+            for inv in inventory
+        ),
+    )
 
     return inventory
 
@@ -330,15 +325,13 @@ def generate_and_insert_mailing_lists(conn: sqlite3.Connection) -> List[int]:
 
     # Insert mailing lists
     cursor = conn.cursor()
+    list_ids = []
     for ml in mailing_lists:
         cursor.execute(
             "INSERT INTO mailing_lists (name, description, created_by) VALUES (?, ?, ?)",
             (ml["name"], ml["description"], ml["created_by"]),
         )
-
-    # Get list IDs
-    cursor.execute("SELECT list_id FROM mailing_lists")
-    list_ids = [row[0] for row in cursor.fetchall()]
+        list_ids.append(cursor.lastrowid)
 
     return list_ids
 
@@ -398,17 +391,18 @@ def generate_and_insert_list_members(
                 )
 
     # Insert list members
-    cursor = conn.cursor()
-    for member in list_members:
-        cursor.execute(
-            "INSERT INTO list_members (list_id, customer_id, address_id, status) VALUES (?, ?, ?, ?)",
+    conn.executemany(
+        "INSERT INTO list_members (list_id, customer_id, address_id, status) VALUES (?, ?, ?, ?)",
+        (
             (
                 member["list_id"],
                 member["customer_id"],
                 member["address_id"],
                 member["status"],
-            ),
-        )
+            )
+            for member in list_members
+        ),
+    )
 
     return list_members
 
@@ -459,6 +453,7 @@ def generate_and_insert_campaigns(conn: sqlite3.Connection, list_ids: List[int])
 
     # Insert campaigns
     cursor = conn.cursor()
+    campaign_ids = []
     for campaign in campaigns:
         cursor.execute(
             """
@@ -475,10 +470,7 @@ def generate_and_insert_campaigns(conn: sqlite3.Connection, list_ids: List[int])
                 campaign["status"],
             ),
         )
-
-    # Get campaign IDs
-    cursor.execute("SELECT campaign_id FROM mailing_campaigns")
-    campaign_ids = [row[0] for row in cursor.fetchall()]
+        campaign_ids.append(cursor.lastrowid)
 
     return campaign_ids
 
@@ -535,6 +527,7 @@ def generate_and_insert_mail_items(
                     )
 
     # Insert mail items
+    mail_item_ids = []
     for item in mail_items:
         cursor.execute(
             """
@@ -550,10 +543,7 @@ def generate_and_insert_mail_items(
                 item["status"],
             ),
         )
-
-    # Get mail item IDs
-    cursor.execute("SELECT item_id FROM mail_items")
-    mail_item_ids = [row[0] for row in cursor.fetchall()]
+        mail_item_ids.append(cursor.lastrowid)
 
     return mail_item_ids
 
@@ -589,6 +579,7 @@ def generate_and_insert_print_jobs(conn: sqlite3.Connection) -> List[int]:
 
     # Insert print jobs
     cursor = conn.cursor()
+    job_ids = []
     for job in print_jobs:
         cursor.execute(
             """
@@ -598,10 +589,7 @@ def generate_and_insert_print_jobs(conn: sqlite3.Connection) -> List[int]:
             """,
             (job["name"], job["description"], job["status"], job["scheduled_date"]),
         )
-
-    # Get print job IDs
-    cursor.execute("SELECT job_id FROM print_jobs")
-    job_ids = [row[0] for row in cursor.fetchall()]
+        job_ids.append(cursor.lastrowid)
 
     return job_ids
 
@@ -649,38 +637,24 @@ def generate_and_insert_print_queue(
                     }
                 )
 
-    # Insert print queue entries
-    cursor = conn.cursor()
-    for entry in print_queue:
-        if entry["printed_at"]:
-            cursor.execute(
-                """
-                INSERT INTO print_queue
-                (job_id, item_id, print_order, status, printed_at)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    entry["job_id"],
-                    entry["item_id"],
-                    entry["print_order"],
-                    entry["status"],
-                    entry["printed_at"],
-                ),
-            )
-        else:
-            cursor.execute(
-                """
-                INSERT INTO print_queue
-                (job_id, item_id, print_order, status)
-                VALUES (?, ?, ?, ?)
-                """,
-                (
-                    entry["job_id"],
-                    entry["item_id"],
-                    entry["print_order"],
-                    entry["status"],
-                ),
+    # Insert print queue entries; printed_at is NULL for items not printed yet
+    conn.executemany(
+        """
+        INSERT INTO print_queue
+        (job_id, item_id, print_order, status, printed_at)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        (
+            (
+                entry["job_id"],
+                entry["item_id"],
+                entry["print_order"],
+                entry["status"],
+                entry["printed_at"],
             )
+            for entry in print_queue
+        ),
+    )
 
     return print_queue
 
@@ -738,42 +712,26 @@ def generate_and_insert_delivery_tracking(conn: sqlite3.Connection, mail_item_id
             }
         )
 
-    # Insert tracking entries
-    cursor = conn.cursor()
-    for entry in tracking_entries:
-        if entry["actual_delivery"]:
-            cursor.execute(
-                """
-                INSERT INTO delivery_tracking
-                (item_id, tracking_number, carrier, status, shipped_date, estimated_delivery, actual_delivery)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    entry["item_id"],
-                    entry["tracking_number"],
-                    entry["carrier"],
-                    entry["status"],
-                    entry["shipped_date"],
-                    entry["estimated_delivery"],
-                    entry["actual_delivery"],
-                ),
-            )
-        else:
-            cursor.execute(
-                """
-                INSERT INTO delivery_tracking
-                (item_id, tracking_number, carrier, status, shipped_date, estimated_delivery)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    entry["item_id"],
-                    entry["tracking_number"],
-                    entry["carrier"],
-                    entry["status"],
-                    entry["shipped_date"],
-                    entry["estimated_delivery"],
-                ),
+    # Insert tracking entries; actual_delivery is NULL until delivered
+    conn.executemany(
+        """
+        INSERT INTO delivery_tracking
+        (item_id, tracking_number, carrier, status, shipped_date, estimated_delivery, actual_delivery)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            (
+                entry["item_id"],
+                entry["tracking_number"],
+                entry["carrier"],
+                entry["status"],
+                entry["shipped_date"],
+                entry["estimated_delivery"],
+                entry["actual_delivery"],
             )
+            for entry in tracking_entries
+        ),
+    )
 
     return tracking_entries
 
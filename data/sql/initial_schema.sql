@@ -149,9 +149,11 @@ CREATE INDEX IF NOT EXISTS idx_addresses_customer_id ON addresses(customer_id);
 CREATE INDEX IF NOT EXISTS idx_inventory_material_id ON inventory(material_id);
 CREATE INDEX IF NOT EXISTS idx_list_members_list_id ON list_members(list_id);
 CREATE INDEX IF NOT EXISTS idx_list_members_customer_id ON list_members(customer_id);
+CREATE INDEX IF NOT EXISTS idx_list_members_address_id ON list_members(address_id);
 CREATE INDEX IF NOT EXISTS idx_mailing_campaigns_list_id ON mailing_campaigns(list_id);
 CREATE INDEX IF NOT EXISTS idx_mail_items_campaign_id ON mail_items(campaign_id);
 CREATE INDEX IF NOT EXISTS idx_mail_items_customer_id ON mail_items(customer_id);
+CREATE INDEX IF NOT EXISTS idx_mail_items_address_id ON mail_items(address_id);
 CREATE INDEX IF NOT EXISTS idx_print_queue_job_id ON print_queue(job_id);
 CREATE INDEX IF NOT EXISTS idx_print_queue_item_id ON print_queue(item_id);
 CREATE INDEX IF NOT EXISTS idx_delivery_tracking_item_id ON delivery_tracking(item_id);
@@ -4,7 +4,7 @@ Complex chained stored procedures for PostgreSQL.
 This module provides utilities for creating and testing complex chained stored procedures
 with branching execution paths for the mail printing and stuffing system.
 """
-from typing import List, Optional
+from typing import Any, List, Optional
 
 from src.database.db_interface import DatabaseInterface
 
@@ -34,6 +34,7 @@ def create_complex_procedures(db: DatabaseInterface) -> None:
     _create_schedule_delivery_procedure(db)
     _create_audit_logging_function(db)
     _create_audit_trigger(db)
+    _create_print_job_name_index(db)
 
 
 def _create_process_campaign_procedure(db: DatabaseInterface) -> None:
@@ -412,6 +413,18 @@ def _create_audit_trigger(db: DatabaseInterface) -> None:
     db.execute(trigger)
 
 
+def _create_print_job_name_index(db: DatabaseInterface) -> None:
+    """
+    Create an index for looking up the print job created for a campaign.
+
+    The procedures name each job after its campaign, so the job is found by name.
+
+    Args:
+        db: Database interface
+    """
+    db.execute("CREATE INDEX IF NOT EXISTS idx_print_jobs_name ON print_jobs (name)")
+
+
 def call_process_campaign(db: DatabaseInterface, campaign_id: int) -> None:
     """
     Call the process_campaign stored procedure.
@@ -432,13 +445,16 @@ def call_process_campaign(db: DatabaseInterface, campaign_id: int) -> None:
     db.commit()
 
 
-def get_audit_logs(db: DatabaseInterface, related_id: Optional[int] = None) -> List[dict]:
+def get_audit_logs(
+    db: DatabaseInterface, related_id: Optional[int] = None, actions: Optional[List[str]] = None
+) -> List[dict]:
     """
     Get audit logs from the database.
 
     Args:
         db: Database interface
         related_id: Optional ID to filter logs by
+        actions: Optional list of actions to filter logs by
 
     Returns:
         List of audit log entries
@@ -450,8 +466,16 @@ def get_audit_logs(db: DatabaseInterface, related_id: Optional[int] = None) -> L
     if db.__class__.__name__ != "PostgreSQLInterface":
         raise ValueError("Audit logs are only available in PostgreSQL databases")
 
-    # Query the logs
+    # Filter in the query so only the requested rows are returned
+    conditions = []
+    params: List[Any] = []
     if related_id is not None:
-        return db.query("SELECT * FROM audit_log WHERE related_id = %s ORDER BY created_at", (related_id,))
-    else:
-        return db.query("SELECT * FROM audit_log ORDER BY created_at")
+        conditions.append("related_id = %s")
+        params.append(related_id)
+    if actions is not None:
+        conditions.append("action = ANY(%s)")
+        params.append(list(actions))
+
+    # Query the logs
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return db.query(f"SELECT * FROM audit_log{where} ORDER BY created_at", tuple(params))
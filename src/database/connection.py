@@ -4,25 +4,32 @@ This module provides functions to create, connect to, and manage SQLite database
 """
 import sqlite3
 from pathlib import Path
-from typing import Optional, Union
+from typing import List, Optional, Union
 
+# Size of each connection's prepared statement cache, raised from the sqlite3
+# default of 128 so statements reused across a session stay prepared
+CACHED_STATEMENTS = 256
 
-def get_connection(db_path: Union[str, Path], in_memory: bool = False) -> sqlite3.Connection:
+
+def get_connection(db_path: Union[str, Path], in_memory: bool = False, uri: bool = False) -> sqlite3.Connection:
     """
     Get a connection to a SQLite database.
 
     Args:
-        db_path: Path to the SQLite database file
+        db_path: Path to the SQLite database file, or a "file:" URI if uri is True
         in_memory: If True, create an in-memory database instead of using the file
+        uri: If True, interpret db_path as a SQLite URI (e.g. "file:name?mode=memory&cache=shared")
 
     Returns:
         A SQLite connection object
     """
-    if in_memory:
-        conn = sqlite3.connect(":memory:")
+    if uri:
+        conn = sqlite3.connect(str(db_path), uri=True, cached_statements=CACHED_STATEMENTS)
+    elif in_memory:
+        conn = sqlite3.connect(":memory:", cached_statements=CACHED_STATEMENTS)
     else:
         db_path = Path(db_path)
-        conn = sqlite3.connect(str(db_path))
+        conn = sqlite3.connect(str(db_path), cached_statements=CACHED_STATEMENTS)
 
     # Enable foreign keys
     conn.execute("PRAGMA foreign_keys = ON")
@@ -49,6 +56,40 @@ def execute_script(conn: sqlite3.Connection, script_path: Union[str, Path]) -> N
     conn.commit()
 
 
+def split_statements(script: str) -> List[str]:
+    """
+    Split a SQL script into individual statements.
+
+    Unlike executescript(), running the statements one at a time with execute()
+    does not commit a pending transaction first, so a script can be applied as
+    part of a larger transaction.
+
+    Args:
+        script: SQL script string
+
+    Returns:
+        List of complete SQL statements
+    """
+    statements = []
+    current = ""
+    # Check at every semicolon, so statements sharing a line are split apart;
+    # complete_statement() is False for a semicolon inside a string literal,
+    # comment or trigger body, so those accumulate until the statement ends
+    *chunks, tail = script.split(";")
+    for chunk in chunks:
+        current += chunk + ";"
+        if sqlite3.complete_statement(current):
+            statements.append(current.strip())
+            current = ""
+    current += tail
+
+    # Anything left over is either comments/whitespace or an unterminated statement
+    if current.strip():
+        statements.append(current.strip())
+
+    return statements
+
+
 def execute_query(conn: sqlite3.Connection, query: str, params: Optional[tuple] = None) -> list:
     """
     Execute a SQL query and return the results.
@@ -6,16 +6,23 @@ This module provides an abstraction layer for working with different database ba
 """
 import sqlite3
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_batch
+
+if TYPE_CHECKING:
+    from src.database.schema_manager import SchemaManager
 
 
 class DatabaseInterface(ABC):
     """Abstract base class for database interfaces."""
 
+    # Schema manager for this interface, created and cached by get_schema_manager()
+    _schema_manager: Optional["SchemaManager"] = None
+
     @abstractmethod
     def connect(self) -> None:
         """Establish a connection to the database."""
@@ -80,6 +87,22 @@ class DatabaseInterface(ABC):
         """Get the underlying database connection object."""
 
 
+@lru_cache(maxsize=256)
+def _sqlite_placeholders(query: str) -> str:
+    """Convert %s placeholders to SQLite's ? style.
+
+    Tests send the same statements over and over, so each distinct query is
+    only rewritten once.
+
+    Args:
+        query: SQL query string with %s placeholders
+
+    Returns:
+        The query with ? placeholders
+    """
+    return query.replace("%s", "?")
+
+
 class SQLiteInterface(DatabaseInterface):
     """SQLite implementation of the database interface."""
 
@@ -131,7 +154,7 @@ class SQLiteInterface(DatabaseInterface):
             raise RuntimeError("Database connection could not be established")
 
         # Convert %s placeholders to ? for SQLite
-        query = query.replace("%s", "?")
+        query = _sqlite_placeholders(query)
 
         if params:
             self._conn.execute(query, params)
@@ -153,7 +176,7 @@ class SQLiteInterface(DatabaseInterface):
             raise RuntimeError("Database connection could not be established")
 
         # Convert %s placeholders to ? for SQLite
-        query = query.replace("%s", "?")
+        query = _sqlite_placeholders(query)
 
         self._conn.executemany(query, params_list)
 
@@ -175,7 +198,7 @@ class SQLiteInterface(DatabaseInterface):
             raise RuntimeError("Database connection could not be established")
 
         # Convert %s placeholders to ? for SQLite
-        query = query.replace("%s", "?")
+        query = _sqlite_placeholders(query)
 
         cursor = self._conn.cursor()
 
@@ -243,6 +266,7 @@ class PostgreSQLInterface(DatabaseInterface):
         password: str,
         host: str = "localhost",
         port: int = 5432,
+        schema: Optional[str] = None,
     ) -> None:
         """
         Initialize a PostgreSQL database interface.
@@ -253,12 +277,14 @@ class PostgreSQLInterface(DatabaseInterface):
             password: Password
             host: Host address
             port: Port number
+            schema: Optional schema to put first on the search path
         """
         self.dbname = dbname
         self.user = user
         self.password = password
         self.host = host
         self.port = port
+        self.schema = schema
         self._conn: Optional[Any] = None
 
     def connect(self) -> None:
@@ -269,6 +295,7 @@ class PostgreSQLInterface(DatabaseInterface):
             password=self.password,
             host=self.host,
             port=self.port,
+            options=f"-c search_path={self.schema},public" if self.schema else None,
         )
 
     def close(self) -> None:
@@ -320,7 +347,9 @@ class PostgreSQLInterface(DatabaseInterface):
 
         try:
             with self._conn.cursor() as cursor:
-                cursor.executemany(query, params_list)
+                # cursor.executemany() makes one server round trip per row;
+                # execute_batch() sends the rows in pages of statements
+                execute_batch(cursor, query, params_list)
         except Exception:
             # If an error occurs, rollback the transaction
             if hasattr(self._conn, "rollback"):
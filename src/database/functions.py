@@ -14,9 +14,13 @@ def register_functions(conn: sqlite3.Connection) -> None:
     Args:
         conn: SQLite connection
     """
-    # Register scalar functions
-    conn.create_function("calculate_postage", 2, calculate_postage)
-    conn.create_function("validate_address", 1, validate_address)
+    # Register scalar functions; the pure ones are marked deterministic so SQLite
+    # can evaluate calls with constant arguments once per statement instead of
+    # once per row, and allow them in indexes and generated columns
+    conn.create_function("calculate_postage", 2, calculate_postage, deterministic=True)
+    conn.create_function("validate_address", 1, validate_address, deterministic=True)
+
+    # generate_tracking embeds the current time, so it must be called for every row
     conn.create_function("generate_tracking", 1, generate_tracking)
 
     # Register aggregate functions
@@ -111,7 +115,14 @@ def generate_tracking(carrier_code: str) -> str:
 
 
 class BatchCounter:
-    """SQLite aggregate function to count items in a batch with custom logic."""
+    """SQLite aggregate function to count items in a batch with custom logic.
+
+    For text padded with ASCII whitespace this is equivalent to the built-in
+    count(NULLIF(trim(value, ' ' || char(9, 10, 11, 12, 13)), '')), which avoids
+    a Python call per row and is preferable in queries over large tables; plain
+    trim() only strips spaces. It is not a drop-in replacement for other types,
+    since BatchCounter also skips falsy values such as 0.
+    """
 
     def __init__(self):
         self.count = 0
@@ -4,7 +4,8 @@ PostgreSQL stored procedures and functions.
 This module provides utilities for creating and managing PostgreSQL stored procedures
 and functions for the mail printing and stuffing system.
 """
-from typing import List, Optional, Union
+from itertools import chain
+from typing import List, Optional, Tuple, Union
 
 from src.database.db_interface import DatabaseInterface
 
@@ -320,6 +321,39 @@ def validate_address(db: DatabaseInterface, street_line1: str, city: str, state:
     return results[0]["is_valid"]
 
 
+def validate_addresses(db: DatabaseInterface, addresses: List[Tuple[str, str, str, str]]) -> List[bool]:
+    """
+    Call the validate_address function for several addresses in one query.
+
+    Args:
+        db: Database interface
+        addresses: (street_line1, city, state, postal_code) tuples
+
+    Returns:
+        Whether each address is valid, in the order given
+
+    Raises:
+        ValueError: If the database is not PostgreSQL
+    """
+    # Verify that the database is PostgreSQL
+    # First check the class name (most reliable)
+    if db.__class__.__name__ == "PostgreSQLInterface":
+        pass  # This is a PostgreSQL database
+    # Fall back to the connection module check
+    elif not hasattr(db.connection, "__module__") or "psycopg2" not in db.connection.__module__:
+        raise ValueError("Stored functions can only be called in PostgreSQL databases")
+
+    if not addresses:
+        return []
+
+    # Call the function once per address, each result in its own column
+    columns = ", ".join(f"validate_address(%s, %s, %s, %s) AS r{i}" for i in range(len(addresses)))
+    params = tuple(chain.from_iterable(addresses))
+    row = db.query(f"SELECT {columns}", params)[0]
+
+    return [row[f"r{i}"] for i in range(len(addresses))]
+
+
 def get_campaign_stats(db: DatabaseInterface, campaign_id: int) -> dict:
     """
     Call the get_campaign_stats function.
@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Union
 
 from src.database.connection import execute_script
+from src.database.schema_manager import FOREIGN_KEY_INDEXES
 
 
 def init_schema(conn: sqlite3.Connection, schema_path: Union[str, Path]) -> None:
@@ -218,6 +219,10 @@ def create_tables(conn: sqlite3.Connection) -> None:
     """
     )
 
+    # Indexes on foreign key columns (SQLite does not create these automatically)
+    for index_name, table, column in FOREIGN_KEY_INDEXES:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({column})")
+
     # Commit all changes
     conn.commit()
 
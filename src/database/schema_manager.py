@@ -5,9 +5,94 @@ This module provides functionality to create and manage database schemas
 for different database backends (SQLite and PostgreSQL).
 """
 from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Tuple
 
 from src.database.db_interface import DatabaseInterface, PostgreSQLInterface, SQLiteInterface
 
+# Indexes on foreign key columns as (index name, table, column). Neither SQLite
+# nor PostgreSQL creates these automatically for a FOREIGN KEY.
+FOREIGN_KEY_INDEXES = [
+    ("idx_addresses_customer_id", "addresses", "customer_id"),
+    ("idx_inventory_material_id", "inventory", "material_id"),
+    ("idx_list_members_list_id", "list_members", "list_id"),
+    ("idx_list_members_customer_id", "list_members", "customer_id"),
+    ("idx_list_members_address_id", "list_members", "address_id"),
+    ("idx_mailing_campaigns_list_id", "mailing_campaigns", "list_id"),
+    ("idx_mail_items_campaign_id", "mail_items", "campaign_id"),
+    ("idx_mail_items_customer_id", "mail_items", "customer_id"),
+    ("idx_mail_items_address_id", "mail_items", "address_id"),
+    ("idx_print_queue_job_id", "print_queue", "job_id"),
+    ("idx_print_queue_item_id", "print_queue", "item_id"),
+    ("idx_delivery_tracking_item_id", "delivery_tracking", "item_id"),
+]
+
+# All tables, with each table listed before the tables it references, so they
+# can be dropped or cleared in this order without violating foreign keys.
+TABLES = [
+    "delivery_tracking",
+    "print_queue",
+    "mail_items",
+    "print_jobs",
+    "mailing_campaigns",
+    "list_members",
+    "mailing_lists",
+    "inventory",
+    "materials",
+    "addresses",
+    "customers",
+]
+
+
+@lru_cache(maxsize=None)
+def sqlite_clear_statements(tables: Tuple[str, ...], reset_sequence: bool = True) -> Tuple[str, ...]:
+    """
+    Build the SQLite statements that delete every row from the given tables.
+
+    Table names cannot be bound as parameters, so the statements are built with
+    string formatting; caching them means each distinct table list is only
+    formatted once.
+
+    Args:
+        tables: Names of the tables to clear, children before parents
+        reset_sequence: Whether to also reset the tables' auto-increment counters
+
+    Returns:
+        The statements, in the order they must run
+    """
+    statements = [f"DELETE FROM {table}" for table in tables]
+
+    # Reset every table's auto-increment counter with a single statement
+    if reset_sequence:
+        names = ", ".join(f"'{table}'" for table in tables)
+        statements.append(f"DELETE FROM sqlite_sequence WHERE name IN ({names})")
+
+    return tuple(statements)
+
+
+@lru_cache(maxsize=None)
+def sqlite_clear_script(tables: Tuple[str, ...], reset_sequence: bool = True) -> str:
+    """
+    Build a script that clears the given tables in its own transaction.
+
+    The script is meant for executescript(), which commits any pending
+    transaction before running it.
+
+    Args:
+        tables: Names of the tables to clear, children before parents
+        reset_sequence: Whether to also reset the tables' auto-increment counters
+
+    Returns:
+        The SQL script
+    """
+    # Check foreign keys once at COMMIT rather than switching them off; unlike
+    # foreign_keys, the pragma resets itself when the transaction ends
+    statements = ["BEGIN", "PRAGMA defer_foreign_keys = ON"]
+    statements.extend(sqlite_clear_statements(tables, reset_sequence))
+    statements.append("COMMIT")
+
+    return ";\n".join(statements) + ";"
+
 
 class SchemaManager(ABC):
     """Abstract base class for schema managers."""
@@ -29,57 +114,75 @@ class SchemaManager(ABC):
     def drop_tables(self) -> None:
         """Drop all database tables."""
 
+    @abstractmethod
+    def clear_tables(self) -> None:
+        """Delete all rows from the database tables, keeping the schema."""
+
+    def _create_indexes(self) -> None:
+        """Create indexes on the foreign key columns."""
+        for index_name, table, column in FOREIGN_KEY_INDEXES:
+            self.db.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({column})")
+
 
 class SQLiteSchemaManager(SchemaManager):
     """Schema manager for SQLite databases."""
 
     def create_tables(self) -> None:
         """Create all tables for the mail printing and stuffing database."""
-        # Create tables in order of dependencies
-        self._create_customers_table()
-        self._create_addresses_table()
-        self._create_materials_table()
-        self._create_inventory_table()
-        self._create_mailing_lists_table()
-        self._create_list_members_table()
-        self._create_mailing_campaigns_table()
-        self._create_mail_items_table()
-        self._create_print_jobs_table()
-        self._create_print_queue_table()
-        self._create_delivery_tracking_table()
-
-        # Commit the changes
-        self.db.commit()
+        # sqlite3 runs DDL in autocommit mode, so open a transaction explicitly
+        # to create every table in a single commit. If the caller already has
+        # one open, work inside a savepoint and leave the commit to the caller.
+        owns_transaction = not self.db.connection.in_transaction
+        self.db.execute("BEGIN" if owns_transaction else "SAVEPOINT create_tables")
+
+        try:
+            # Create tables in order of dependencies
+            self._create_customers_table()
+            self._create_addresses_table()
+            self._create_materials_table()
+            self._create_inventory_table()
+            self._create_mailing_lists_table()
+            self._create_list_members_table()
+            self._create_mailing_campaigns_table()
+            self._create_mail_items_table()
+            self._create_print_jobs_table()
+            self._create_print_queue_table()
+            self._create_delivery_tracking_table()
+            self._create_indexes()
+        except Exception:
+            # Leave no partially created schema behind, and none of the caller's work undone
+            if owns_transaction:
+                self.db.rollback()
+            else:
+                self.db.execute("ROLLBACK TO SAVEPOINT create_tables")
+                self.db.execute("RELEASE SAVEPOINT create_tables")
+            raise
+
+        # Commit the changes, or fold them into the caller's transaction
+        if owns_transaction:
+            self.db.commit()
+        else:
+            self.db.execute("RELEASE SAVEPOINT create_tables")
 
     def drop_tables(self) -> None:
         """Drop all tables in the database."""
-        tables = [
-            "delivery_tracking",
-            "print_queue",
-            "mail_items",
-            "print_jobs",
-            "mailing_campaigns",
-            "list_members",
-            "mailing_lists",
-            "inventory",
-            "materials",
-            "addresses",
-            "customers",
-        ]
-
-        # Disable foreign key constraints temporarily
-        self.db.execute("PRAGMA foreign_keys = OFF")
-
-        # Drop each table
-        for table in tables:
-            self.db.execute(f"DROP TABLE IF EXISTS {table}")
-
-        # Re-enable foreign key constraints
-        self.db.execute("PRAGMA foreign_keys = ON")
+        # Drop every table in a single script, with foreign key constraints
+        # disabled for the duration so the drop order doesn't matter
+        script = "\n".join(
+            ["PRAGMA foreign_keys = OFF;"]
+            + [f"DROP TABLE IF EXISTS {table};" for table in TABLES]
+            + ["PRAGMA foreign_keys = ON;"]
+        )
+        self.db.execute_script(script)
 
         # Commit the changes
         self.db.commit()
 
+    def clear_tables(self) -> None:
+        """Delete all rows from the database tables and reset their row IDs."""
+        # The script commits its own transaction
+        self.db.execute_script(sqlite_clear_script(tuple(TABLES)))
+
     def _create_customers_table(self) -> None:
         """Create the customers table."""
         self.db.execute(
@@ -298,33 +401,28 @@ class PostgreSQLSchemaManager(SchemaManager):
         self._create_print_jobs_table()
         self._create_print_queue_table()
         self._create_delivery_tracking_table()
+        self._create_indexes()
 
         # Commit the changes
         self.db.commit()
 
     def drop_tables(self) -> None:
         """Drop all tables in the database."""
-        tables = [
-            "delivery_tracking",
-            "print_queue",
-            "mail_items",
-            "print_jobs",
-            "mailing_campaigns",
-            "list_members",
-            "mailing_lists",
-            "inventory",
-            "materials",
-            "addresses",
-            "customers",
-        ]
-
         # Drop each table with cascade to handle dependencies
-        for table in tables:
+        for table in TABLES:
             self.db.execute(f"DROP TABLE IF EXISTS {table} CASCADE")
 
         # Commit the changes
         self.db.commit()
 
+    def clear_tables(self) -> None:
+        """Delete all rows from the database tables and reset their sequences."""
+        # A single TRUNCATE covers every table, so no ordering is needed
+        self.db.execute(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE")
+
+        # Commit the changes
+        self.db.commit()
+
     def _create_customers_table(self) -> None:
         """Create the customers table."""
         self.db.execute(
@@ -526,16 +624,46 @@ class PostgreSQLSchemaManager(SchemaManager):
         )
 
 
+# Direct mapping from interface class to schema manager class, so the common
+# case is resolved with a single dictionary lookup
+_SCHEMA_MANAGER_CLASSES = {
+    SQLiteInterface: SQLiteSchemaManager,
+    PostgreSQLInterface: PostgreSQLSchemaManager,
+}
+
+
 def get_schema_manager(db: DatabaseInterface) -> SchemaManager:
     """
     Factory function to create a schema manager for the given database.
 
+    The schema manager is cached on the database interface, so repeated calls
+    for the same interface return the same manager.
+
+    Args:
+        db: Database interface
+
+    Returns:
+        A SchemaManager implementation
+    """
+    if db._schema_manager is None:
+        db._schema_manager = _create_schema_manager(db)
+    return db._schema_manager
+
+
+def _create_schema_manager(db: DatabaseInterface) -> SchemaManager:
+    """
+    Create a new schema manager for the given database.
+
     Args:
         db: Database interface
 
     Returns:
         A SchemaManager implementation
     """
+    manager_cls = _SCHEMA_MANAGER_CLASSES.get(type(db))
+    if manager_cls is not None:
+        return manager_cls(db)
+
     if hasattr(db, "connection") and hasattr(db.connection, "__module__"):
         if "sqlite3" in db.connection.__module__:
             return SQLiteSchemaManager(db)
@@ -5,11 +5,17 @@ This module provides functions to transform and migrate data within the database
 import json
 import re
 import sqlite3
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Any, FrozenSet, List, Optional, Union
 
 from src.database.connection import execute_query
 
+# SQL identifiers should only contain alphanumeric chars, underscores
+# and shouldn't start with a number
+_IDENTIFIER_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+
 
 def _is_valid_identifier(identifier: str) -> bool:
     """
@@ -22,10 +28,7 @@ def _is_valid_identifier(identifier: str) -> bool:
     Returns:
         bool: True if the identifier is valid, False otherwise
     """
-    # SQL identifiers should only contain alphanumeric chars, underscores
-    # and shouldn't start with a number
-    pattern = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
-    return bool(pattern.match(identifier))
+    return bool(_IDENTIFIER_RE.match(identifier))
 
 
 class DataMigration:
@@ -57,16 +60,16 @@ class DataMigration:
         )
         self.conn.commit()
 
-    def get_applied_migrations(self) -> List[str]:
+    def get_applied_migrations(self) -> FrozenSet[str]:
         """
-        Get a list of already applied data migrations.
+        Get the set of already applied data migrations.
 
         Returns:
-            List of applied migration IDs
+            Set of applied migration IDs
         """
         cursor = self.conn.cursor()
-        cursor.execute("SELECT migration_id FROM data_migrations ORDER BY id")
-        migrations = [row[0] for row in cursor.fetchall()]
+        cursor.execute("SELECT migration_id FROM data_migrations")
+        migrations = frozenset(row[0] for row in cursor)
         cursor.close()
         return migrations
 
@@ -118,24 +121,28 @@ def transform_addresses(conn: sqlite3.Connection) -> None:
     Args:
         conn: SQLite connection
     """
-    # Get all addresses
-    addresses = execute_query(conn, "SELECT * FROM addresses")
-
-    # Update each address
-    for address in addresses:
-        # Example transformation: Standardize state codes to uppercase
-        state = address["state"].upper()
-
-        # Example transformation: Format postal codes consistently
-        postal_code = address["postal_code"].strip()
-        if len(postal_code) == 9 and postal_code.isdigit():
-            postal_code = f"{postal_code[:5]}-{postal_code[5:]}"
-
-        # Update the record
-        conn.execute(
-            "UPDATE addresses SET state = ?, postal_code = ? WHERE address_id = ?",
-            (state, postal_code, address["address_id"]),
-        )
+    # Transform every address in a single set-based UPDATE:
+    # - Standardize state codes to uppercase
+    # - Format 9-digit postal codes consistently as ZIP+4
+    # TRIM() only strips spaces by default, so the subquery passes it the ASCII
+    # whitespace characters that str.strip() removes as well
+    conn.execute(
+        """
+    UPDATE addresses
+    SET
+        state = UPPER(state),
+        postal_code = CASE
+            WHEN LENGTH(trimmed.code) = 9 AND trimmed.code NOT GLOB '*[^0-9]*'
+                THEN SUBSTR(trimmed.code, 1, 5) || '-' || SUBSTR(trimmed.code, 6)
+            ELSE trimmed.code
+        END
+    FROM (
+        SELECT address_id, TRIM(postal_code, ' ' || char(9, 10, 11, 12, 13)) AS code
+        FROM addresses
+    ) AS trimmed
+    WHERE trimmed.address_id = addresses.address_id
+    """
+    )
 
     conn.commit()
 
@@ -147,20 +154,26 @@ def merge_duplicate_customers(conn: sqlite3.Connection) -> None:
     Args:
         conn: SQLite connection
     """
-    # Find potential duplicates based on email
-    duplicates = execute_query(
+    # Find potential duplicates based on email, ordered so each email's
+    # records are adjacent with the lowest customer ID first
+    rows = execute_query(
         conn,
         """
-    SELECT email, COUNT(*) as count, GROUP_CONCAT(customer_id) as customer_ids
+    SELECT email, customer_id
     FROM customers
-    WHERE email IS NOT NULL
-    GROUP BY email
-    HAVING count > 1
+    WHERE email IN (
+        SELECT email
+        FROM customers
+        WHERE email IS NOT NULL
+        GROUP BY email
+        HAVING COUNT(*) > 1
+    )
+    ORDER BY email, customer_id
     """,
     )
 
-    for dup in duplicates:
-        customer_ids = dup["customer_ids"].split(",")
+    for _, group in groupby(rows, key=itemgetter("email")):
+        customer_ids = [row["customer_id"] for row in group]
         primary_id = customer_ids[0]  # Keep the first one as primary
         duplicate_ids = customer_ids[1:]  # Others will be merged
 
@@ -207,7 +220,7 @@ def update_price_calculations(conn: sqlite3.Connection) -> None:
     conn.commit()
 
 
-def import_data_from_json(conn: sqlite3.Connection, json_file: Union[str, Path], table: str) -> int:
+def import_data_from_json(conn: sqlite3.Connection, json_file: Union[str, Path], table: str, bulk: bool = False) -> int:
     """
     Import data from a JSON file into a table.
 
@@ -215,6 +228,8 @@ def import_data_from_json(conn: sqlite3.Connection, json_file: Union[str, Path],
         conn: SQLite connection
         json_file: Path to JSON file containing records
         table: Target table name
+        bulk: If True, drop the table's non-unique indexes before loading and
+            recreate them afterwards, which is faster for large imports
 
     Returns:
         Number of records imported
@@ -233,10 +248,6 @@ def import_data_from_json(conn: sqlite3.Connection, json_file: Union[str, Path],
     placeholders = ", ".join(["?"] * len(columns))
     columns_str = ", ".join(columns)
 
-    # Insert data
-    cursor = conn.cursor()
-    count = 0
-
     # Validate table name to prevent SQL injection
     if not _is_valid_identifier(table):
         raise ValueError(f"Invalid table name: {table}")
@@ -248,13 +259,50 @@ def import_data_from_json(conn: sqlite3.Connection, json_file: Union[str, Path],
 
     # Now we can safely construct the query with validated identifiers
     query = f"INSERT INTO {table} ({columns_str}) VALUES ({placeholders})"
+    rows = [[record.get(col) for col in columns] for record in data]
 
-    for record in data:
-        values = [record.get(col) for col in columns]
-        cursor.execute(query, values)
-        count += 1
+    if bulk:
+        _bulk_insert_rebuilding_indexes(conn, table, query, rows)
+    else:
+        conn.executemany(query, rows)
+        conn.commit()
 
-    conn.commit()
-    cursor.close()
+    return len(rows)
+
+
+def _bulk_insert_rebuilding_indexes(conn: sqlite3.Connection, table: str, query: str, rows: List[List[Any]]) -> None:
+    """
+    Insert rows with the table's non-unique indexes dropped, then recreate them.
+
+    Args:
+        conn: SQLite connection
+        table: Validated target table name
+        query: INSERT statement for the rows
+        rows: Parameter lists, one per row
+    """
+    try:
+        # Run the whole load, including the index drop and rebuild, as one transaction
+        if not conn.in_transaction:
+            conn.execute("BEGIN TRANSACTION")
+
+        # Save and drop the explicit non-unique indexes. Automatic indexes backing
+        # PRIMARY KEY/UNIQUE constraints have no SQL and are left in place, as are
+        # unique indexes, so constraints are still enforced during the load.
+        cursor = conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+            (table,),
+        )
+        indexes = [(name, sql) for name, sql in cursor.fetchall() if not sql.upper().startswith("CREATE UNIQUE")]
+        for name, _ in indexes:
+            conn.execute(f'DROP INDEX "{name}"')
+
+        conn.executemany(query, rows)
+
+        # Recreate the indexes in a single pass over the loaded data
+        for _, sql in indexes:
+            conn.execute(sql)
 
-    return count
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
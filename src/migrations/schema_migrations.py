@@ -2,12 +2,23 @@
 Schema migration utilities for SQLite.
 This module provides functions to apply schema changes to the database.
 """
+import os
 import re
 import sqlite3
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import FrozenSet, List, Optional, Set, Tuple, Union
 
-from src.database.connection import execute_script
+from src.database.connection import execute_script, split_statements
+
+# BEGIN/COMMIT/END statements a migration script may wrap itself in; migrations
+# already run inside a transaction managed here, so these are skipped
+_TRANSACTION_CONTROL = re.compile(
+    r"(BEGIN(\s+(DEFERRED|IMMEDIATE|EXCLUSIVE))?|COMMIT|END)(\s+TRANSACTION)?\s*;?",
+    re.IGNORECASE,
+)
+
+# Comments, removed before checking a statement against _TRANSACTION_CONTROL
+_SQL_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
 
 
 class SchemaMigration:
@@ -39,51 +50,80 @@ class SchemaMigration:
         )
         self.conn.commit()
 
-    def get_applied_migrations(self) -> List[str]:
+    def get_applied_migrations(self) -> FrozenSet[str]:
         """
-        Get a list of already applied migrations.
+        Get the set of already applied migrations.
 
         Returns:
-            List of applied migration IDs
+            Set of applied migration IDs
         """
         cursor = self.conn.cursor()
-        cursor.execute("SELECT migration_id FROM schema_migrations ORDER BY id")
-        migrations = [row[0] for row in cursor.fetchall()]
+        cursor.execute("SELECT migration_id FROM schema_migrations")
+        migrations = frozenset(row[0] for row in cursor)
         cursor.close()
         return migrations
 
-    def apply_migration(self, migration_path: Union[str, Path], description: Optional[str] = None) -> bool:
+    def _is_applied(self, migration_id: str) -> bool:
         """
-        Apply a single migration from a SQL file.
+        Check whether a single migration has been applied.
 
         Args:
-            migration_path: Path to the migration SQL file
+            migration_id: ID of the migration to check
+
+        Returns:
+            True if the migration is recorded as applied
+        """
+        cursor = self.conn.execute("SELECT 1 FROM schema_migrations WHERE migration_id = ? LIMIT 1", (migration_id,))
+        applied = cursor.fetchone() is not None
+        cursor.close()
+        return applied
+
+    def apply_migration(
+        self,
+        migration: Union[str, Path, Tuple[str, str]],
+        description: Optional[str] = None,
+        applied: Optional[Set[str]] = None,
+    ) -> bool:
+        """
+        Apply a single migration from a SQL file or a SQL string.
+
+        Args:
+            migration: Path to the migration SQL file, or a (migration_id, sql)
+                tuple to apply a script that is already in memory
             description: Optional description of the migration
+            applied: Optional preloaded set of applied migration IDs, used instead
+                of querying the tracking table
 
         Returns:
             True if migration was applied, False if already applied
         """
-        migration_path = Path(migration_path)
-        migration_id = migration_path.stem
+        if isinstance(migration, tuple):
+            migration_id, script = migration
+            description = description or f"Applied migration {migration_id}"
+        else:
+            migration_path = Path(migration)
+            migration_id = migration_path.stem
+            script = None
 
         # Check if migration was already applied
-        applied = self.get_applied_migrations()
-        if migration_id in applied:
+        if applied is not None:
+            if migration_id in applied:
+                return False
+        elif self._is_applied(migration_id):
             return False
 
+        # Only read the file once the migration is known to be needed
+        if script is None:
+            script = migration_path.read_text()
+            description = description or f"Applied from {migration_path.name}"
+
         # Apply the migration
         try:
             # Start a transaction
             self.conn.execute("BEGIN TRANSACTION")
 
-            # Execute the migration script
-            execute_script(self.conn, migration_path)
-
-            # Record the migration
-            self.conn.execute(
-                "INSERT INTO schema_migrations (migration_id, description) VALUES (?, ?)",
-                (migration_id, description or f"Applied from {migration_path.name}"),
-            )
+            # Execute the migration script and record it
+            self._apply_migration_no_tx(migration_id, script, description)
 
             # Commit the transaction
             self.conn.commit()
@@ -94,32 +134,77 @@ class SchemaMigration:
             self.conn.rollback()
             raise RuntimeError(f"Migration failed: {str(e)}")
 
+    def _apply_migration_no_tx(self, migration_id: str, script: str, description: Optional[str] = None) -> None:
+        """
+        Execute a migration script and record it, inside the caller's transaction.
+
+        Args:
+            migration_id: ID to record the migration under
+            script: SQL script of the migration
+            description: Optional description of the migration
+        """
+        # Execute the statements one by one so the open transaction is not
+        # committed, leaving out any transaction control of the script's own
+        for statement in split_statements(script):
+            if not _TRANSACTION_CONTROL.fullmatch(_SQL_COMMENT.sub("", statement).strip()):
+                self.conn.execute(statement)
+
+        # Record the migration
+        self.conn.execute(
+            "INSERT INTO schema_migrations (migration_id, description) VALUES (?, ?)",
+            (migration_id, description),
+        )
+
     def apply_migrations_from_directory(self, directory_path: Union[str, Path]) -> int:
         """
         Apply all migrations from a directory in order.
 
+        All migrations are applied in a single transaction, with a savepoint per
+        file. If a migration fails, it is rolled back, the migrations before it
+        are kept, and a RuntimeError is raised.
+
         Args:
             directory_path: Path to directory containing migration SQL files
 
         Returns:
             Number of migrations applied
         """
-        directory_path = Path(directory_path)
-
-        # Get all SQL files in the directory
-        migration_files = sorted([f for f in directory_path.glob("*.sql") if re.match(r"^\d+_.*\.sql$", f.name)])
-
-        # Get already applied migrations
-        applied = self.get_applied_migrations()
+        # Get all numbered SQL files (e.g. 001_add_columns.sql) in the directory
+        with os.scandir(directory_path) as entries:
+            migration_entries = [
+                entry
+                for entry in entries
+                if entry.name.endswith(".sql") and entry.name.split("_", 1)[0].isdigit() and entry.is_file()
+            ]
+        migration_entries.sort(key=lambda entry: entry.name)
+
+        # Get already applied migrations once for the whole run
+        applied = set(self.get_applied_migrations())
 
         # Apply each migration that hasn't been applied yet
         count = 0
-        for migration_file in migration_files:
-            migration_id = migration_file.stem
-            if migration_id not in applied:
-                self.apply_migration(migration_file)
-                count += 1
-
+        self.conn.execute("BEGIN TRANSACTION")
+        for entry in migration_entries:
+            migration_id = entry.name[: -len(".sql")]
+            if migration_id in applied:
+                continue
+
+            self.conn.execute("SAVEPOINT migration")
+            try:
+                self._apply_migration_no_tx(migration_id, Path(entry.path).read_text(), f"Applied from {entry.name}")
+            except Exception as e:
+                # Undo only this migration, keeping the ones applied before it
+                self.conn.execute("ROLLBACK TO SAVEPOINT migration")
+                self.conn.execute("RELEASE SAVEPOINT migration")
+                self.conn.commit()
+                raise RuntimeError(f"Migration failed: {str(e)}")
+            self.conn.execute("RELEASE SAVEPOINT migration")
+
+            applied.add(migration_id)
+            count += 1
+
+        # Commit all migrations at once
+        self.conn.commit()
         return count
 
     def rollback_migration(self, migration_id: str) -> bool:
@@ -133,8 +218,7 @@ class SchemaMigration:
             True if rollback was successful, False if migration wasn't applied
         """
         # Check if migration was applied
-        applied = self.get_applied_migrations()
-        if migration_id not in applied:
+        if not self._is_applied(migration_id):
             return False
 
         # Look for rollback file
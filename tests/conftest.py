@@ -2,101 +2,345 @@
 PyTest configuration and fixtures for SQLite testing.
 """
 import sqlite3
+from itertools import chain, islice
 from pathlib import Path
-from typing import Generator, Optional, Union
+from typing import Generator, Iterable, Iterator, Union
 
 import pytest
 
-# Import sample data generation functions where needed
-from src.database.connection import execute_script, get_connection
+from data.sample_data import (
+    generate_and_insert_addresses,
+    generate_and_insert_campaigns,
+    generate_and_insert_customers,
+    generate_and_insert_delivery_tracking,
+    generate_and_insert_inventory,
+    generate_and_insert_list_members,
+    generate_and_insert_mail_items,
+    generate_and_insert_mailing_lists,
+    generate_and_insert_materials,
+    generate_and_insert_print_jobs,
+    generate_and_insert_print_queue,
+)
+from data.sample_data import generate_sample_data as gen_sample_data
+from src.database.connection import get_connection
 from src.database.functions import create_triggers, register_functions
 from src.database.schema import create_tables
+from src.database.schema_manager import TABLES, sqlite_clear_script
 
+# Schema script for db_with_schema, read once when conftest is loaded
+_SCHEMA_PATH = Path(__file__).resolve().parent.parent / "data" / "sql" / "initial_schema.sql"
+_SCHEMA_SQL = _SCHEMA_PATH.read_text()
 
-@pytest.fixture(scope="function")
-def db_connection():
+
+def _tune_connection(conn: sqlite3.Connection) -> None:
+    """Apply performance PRAGMAs to a test database connection.
+
+    The test databases live in memory, so there is no durability to trade away
+    and these settings are pure speedups. page_size only takes effect before
+    the first table is created, so this must run before any schema setup.
+
+    Args:
+        conn: SQLite database connection
     """
-    Create an in-memory SQLite database for testing.
-    This fixture provides a fresh database for each test function.
+    conn.executescript(
+        """
+    PRAGMA page_size = 32768;
+    PRAGMA journal_mode = MEMORY;
+    PRAGMA synchronous = OFF;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -65536;
+    PRAGMA locking_mode = EXCLUSIVE;
+    """
+    )
+
+
+def _template_uri(name: str) -> str:
+    """Return the URI of a named, shared-cache in-memory database.
+
+    Args:
+        name: Name of the in-memory database
+
+    Returns:
+        The SQLite URI for the database
+    """
+    return f"file:{name}?mode=memory&cache=shared"
+
+
+def _open_template(name: str) -> sqlite3.Connection:
+    """Open a named, shared-cache in-memory database to use as a template.
+
+    The template connection is held open for the whole session, which keeps
+    the named in-memory database alive; other connections in the same process
+    can open it by name and share its page cache.
+
+    Args:
+        name: Name of the in-memory database
+
+    Returns:
+        A SQLite connection to the template database
+    """
+    conn = get_connection(_template_uri(name), uri=True)
+    _tune_connection(conn)
+    return conn
+
+
+def _clone_connection(template: sqlite3.Connection) -> sqlite3.Connection:
+    """Create a new in-memory database as a copy of a template database.
+
+    SQLite's backup API copies the template page by page, which is much faster
+    than replaying the schema DDL for every test. Custom functions are not
+    stored in the database, so they are registered on the new connection.
+
+    Args:
+        template: SQLite connection to the template database
+
+    Returns:
+        A new SQLite connection with the template's schema and data
     """
-    # Create in-memory database
     conn = get_connection(":memory:", in_memory=True)
+    _tune_connection(conn)
+    template.backup(conn)
+    register_functions(conn)
+    return conn
+
+
+@pytest.fixture(scope="session")
+def _tables_template() -> Generator[sqlite3.Connection, None, None]:
+    """Build the template database for db_connection once per session."""
+    conn = _open_template("tables_template")
 
     # Create tables
     create_tables(conn)
 
-    # Register custom functions
-    register_functions(conn)
-
     # Create triggers
     create_triggers(conn)
 
     yield conn
 
+    conn.close()
+
+
+@pytest.fixture(scope="session")
+def _schema_template() -> Generator[sqlite3.Connection, None, None]:
+    """Build the template database for db_with_schema once per session."""
+    conn = _open_template("schema_template")
+
+    # Load schema from SQL file, which also creates the triggers
+    conn.executescript(_SCHEMA_SQL)
+
+    yield conn
+
+    conn.close()
+
+
+@pytest.fixture(scope="function")
+def db_connection(_tables_template):
+    """
+    Create an in-memory SQLite database for testing.
+    This fixture provides a fresh database for each test function.
+    """
+    # Copy the session template into a fresh in-memory database
+    conn = _clone_connection(_tables_template)
+
+    yield conn
+
     # Close connection after test
     conn.close()
 
 
 @pytest.fixture(scope="function")
-def db_with_schema():
+def db_with_schema(_schema_template):
     """
     Create an in-memory SQLite database with schema loaded from SQL file.
     """
-    # Create in-memory database
-    conn = get_connection(":memory:", in_memory=True)
+    # Copy the session template into a fresh in-memory database
+    conn = _clone_connection(_schema_template)
+
+    yield conn
+
+    # Close connection after test
+    conn.close()
 
-    # Load schema from SQL file
-    schema_path = Path(__file__).parent.parent / "data" / "sql" / "initial_schema.sql"
-    execute_script(conn, schema_path)
 
-    # Register custom functions
+@pytest.fixture(scope="session")
+def _sample_data_template(_schema_template) -> Generator[sqlite3.Connection, None, None]:
+    """Build the template database for db_with_sample_data once per session."""
+    conn = _open_template("sample_data_template")
+
+    # Start from the schema template, which already has the triggers
+    _schema_template.backup(conn)
     register_functions(conn)
 
-    # Create triggers
-    create_triggers(conn)
+    # Generate sample data for tests with the record count expected by tests
+    generate_sample_data_for_tests(conn, record_count=5)
 
     yield conn
 
-    # Close connection after test
     conn.close()
 
 
 @pytest.fixture(scope="function")
-def db_with_sample_data(db_with_schema):
+def db_with_sample_data(_sample_data_template):
     """
     Create an in-memory SQLite database with sample data.
 
+    Each test gets its own copy of the template rather than a savepoint on a
+    shared connection: tests commit their changes, and a COMMIT would release
+    the savepoint and make the changes visible to later tests.
+
     Args:
-        db_with_schema: Fixture that provides a database connection with schema
+        _sample_data_template: Session template with the schema and sample data loaded
     """
-    # Use the connection provided by the db_with_schema fixture
-    db_connection = db_with_schema
+    # Copy the session template into a fresh in-memory database
+    conn = _clone_connection(_sample_data_template)
 
-    # Generate sample data for tests with the record count expected by tests
-    generate_sample_data_for_tests(db_connection, record_count=5)
+    yield conn
 
-    # Create triggers (again after data insertion to ensure they're active)
-    create_triggers(db_connection)
+    # Close connection after test
+    conn.close()
 
-    yield db_connection
 
+@pytest.fixture(scope="module")
+def sample_data_readonly(_sample_data_template):
+    """
+    Open a read-only connection to the shared sample data database.
+
+    The connection shares the session template's in-memory database instead of
+    copying it, so it is opened once per test module. Writes are rejected;
+    tests that modify data should use db_with_sample_data instead.
+
+    Args:
+        _sample_data_template: Session template with the schema and sample data loaded
+    """
+    conn = get_connection(_template_uri("sample_data_template"), uri=True)
+    conn.execute("PRAGMA query_only = ON")
+    register_functions(conn)
 
-def _clear_tables(conn: sqlite3.Connection, tables: list[str]) -> None:
+    yield conn
+
+    # Close connection after the module's tests
+    conn.close()
+
+
+# Tables cleared before loading sample data, children before parents; a tuple
+# so it can key the lru_cache on sqlite_clear_script()
+_SAMPLE_DATA_TABLES = tuple(TABLES)
+
+
+def _clear_tables(conn: sqlite3.Connection, tables: tuple[str, ...]) -> None:
     """Clear all data from the specified tables.
 
+    The deletes run through executescript(), which commits any pending
+    transaction first.
+
     Args:
         conn: SQLite database connection
-        tables: List of table names to clear
+        tables: Names of the tables to clear
     """
-    # Disable foreign key constraints temporarily for clean deletion
-    conn.execute("PRAGMA foreign_keys = OFF")
-    for table in tables:
-        conn.execute(f"DELETE FROM {table}")
-    conn.execute("PRAGMA foreign_keys = ON")
+    # Only reset auto-increment counters if something has been inserted
+    reset_sequence = conn.execute("SELECT 1 FROM sqlite_sequence LIMIT 1").fetchone() is not None
+
+    # Run everything as one script so it is parsed in a single pass
+    conn.executescript(sqlite_clear_script(tables, reset_sequence))
+
+
+# Rows per multi-row INSERT; at 10 columns this stays well under SQLite's
+# limit of 32766 bound parameters per statement
+_INSERT_CHUNK_SIZE = 500
+
+_SQL_INSERT_CUSTOMERS = "INSERT INTO customers (customer_id, name, email, phone) VALUES (?, ?, ?, ?)"
+_SQL_INSERT_ADDRESSES = (
+    "INSERT INTO addresses (address_id, customer_id, address_type, street_line1, street_line2, city, state, "
+    "postal_code, country, is_verified) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_SQL_INSERT_MATERIALS = (
+    "INSERT INTO materials (material_id, name, description, unit_cost, unit_type) VALUES (?, ?, ?, ?, ?)"
+)
+_SQL_INSERT_MAILING_LISTS = "INSERT INTO mailing_lists (list_id, name, description, created_by) VALUES (?, ?, ?, ?)"
+_SQL_INSERT_CAMPAIGNS = (
+    "INSERT INTO mailing_campaigns (campaign_id, name, description, list_id, start_date, end_date, status) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_SQL_INSERT_PRINT_JOBS = (
+    "INSERT INTO print_jobs (job_id, name, description, status, scheduled_date, started_date, completed_date) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+# Static sample rows, built once at import
+_CUSTOMERS = (
+    (None, "John Smith", "john.smith@example.com", "555-123-4567"),
+    (None, "Jane Doe", "jane.doe@example.com", "555-234-5678"),
+    (None, "Bob Johnson", "bob.johnson@example.com", "555-345-6789"),
+    (None, "Alice Brown", "alice.brown@example.com", "555-789-0123"),
+    (None, "Charlie Davis", "charlie.davis@example.com", "555-321-6540"),
+)
+
+_MATERIALS = (
+    (None, "Standard Envelope", "Standard #10 business envelope", 0.05, "each"),
+    (None, "Large Envelope", "9x12 manila envelope", 0.15, "each"),
+    (None, "Standard Paper", "20lb 8.5x11 white paper", 0.02, "sheet"),
+    (None, "Premium Paper", "24lb 8.5x11 ivory paper", 0.04, "sheet"),
+    (None, "Ink - Black", "Black printer ink", 0.10, "page"),
+)
+
+_MAILING_LISTS = (
+    (None, "Monthly Newsletter", "Subscribers to monthly newsletter", "admin"),
+    (None, "Special Offers", "Customers interested in special offers", "marketing"),
+    (None, "Product Updates", "Customers interested in product updates", "product"),
+)
+
+_PRINT_JOBS = (
+    (
+        None,
+        "January Newsletter Batch",
+        "First batch of January newsletter",
+        "queued",
+        "2025-01-10",
+        None,
+        None,
+    ),
+    (
+        None,
+        "Winter Sale Preview",
+        "Preview batch for winter sale",
+        "queued",
+        "2025-01-12",
+        None,
+        None,
+    ),
+)
+
+
+def _insert_returning_ids(
+    conn: sqlite3.Connection, sql: str, rows: Iterable[tuple], chunk_size: int = _INSERT_CHUNK_SIZE
+) -> list[int]:
+    """Insert rows and return the row IDs SQLite assigned to them.
+
+    The rows are sent as multi-row INSERT ... VALUES statements of up to
+    chunk_size rows each. SQLite gives the rows of one INSERT consecutive
+    rowids ending at lastrowid, so the IDs are known without reading them
+    back with a separate SELECT.
+
+    Args:
+        conn: SQLite database connection
+        sql: Single-row INSERT statement with placeholders
+        rows: Parameter tuples to insert
+        chunk_size: Maximum number of rows per INSERT statement
 
-    # Reset auto-increment counters
-    for table in tables:
-        conn.execute(f"DELETE FROM sqlite_sequence WHERE name='{table}'")
+    Returns:
+        List of inserted row IDs, in insertion order
+    """
+    head, row_placeholders = sql.rsplit(" VALUES ", 1)
+    ids: list[int] = []
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunk_size)):
+        cursor = conn.execute(
+            f"{head} VALUES {', '.join([row_placeholders] * len(chunk))}",
+            [value for row in chunk for value in row],
+        )
+        ids.extend(range(cursor.lastrowid - cursor.rowcount + 1, cursor.lastrowid + 1))
+    return ids
 
 
 def _insert_customers(conn: sqlite3.Connection) -> list[int]:
@@ -108,23 +352,7 @@ def _insert_customers(conn: sqlite3.Connection) -> list[int]:
     Returns:
         List of customer IDs
     """
-    customers = [
-        (None, "John Smith", "john.smith@example.com", "555-123-4567"),
-        (None, "Jane Doe", "jane.doe@example.com", "555-234-5678"),
-        (None, "Bob Johnson", "bob.johnson@example.com", "555-345-6789"),
-        (None, "Alice Brown", "alice.brown@example.com", "555-789-0123"),
-        (None, "Charlie Davis", "charlie.davis@example.com", "555-321-6540"),
-    ]
-    conn.executemany(
-        "INSERT INTO customers (customer_id, name, email, phone) VALUES (?, ?, ?, ?)",
-        customers,
-    )
-
-    # Get customer IDs
-    cursor = conn.cursor()
-    cursor.execute("SELECT customer_id FROM customers")
-    customer_ids = [row[0] for row in cursor.fetchall()]
-    return customer_ids
+    return _insert_returning_ids(conn, _SQL_INSERT_CUSTOMERS, _CUSTOMERS)
 
 
 def _insert_addresses(conn: sqlite3.Connection, customer_ids: list[int]) -> list[tuple[int, int]]:
@@ -137,53 +365,31 @@ def _insert_addresses(conn: sqlite3.Connection, customer_ids: list[int]) -> list
     Returns:
         List of (address_id, customer_id) tuples
     """
-    # Define the type for our address tuples
-    AddressTuple = tuple[Optional[int], int, str, str, Optional[str], str, str, str, str, bool]
-    addresses: list[AddressTuple] = []
-    for customer_id in customer_ids:
-        # Home address for every customer
-
-        home_address = (
+    # Home address for every customer, work address for some customers
+    home_addresses = (
+        (None, cid, "home", f"{cid*123} Main St", None, "Anytown", "OH", f"{cid+10000}", "USA", True)
+        for cid in customer_ids
+    )
+    work_addresses = (
+        (
             None,
-            customer_id,
-            "home",
-            f"{customer_id*123} Main St",
-            None,  # street_line2 can be None
-            "Anytown",
+            cid,
+            "work",
+            f"{cid*100} Business Ave",
+            f"Suite {cid*10}",
+            "Workville",
             "OH",
-            f"{customer_id+10000}",
+            f"{cid+20000}",
             "USA",
             True,
         )
-        addresses.append(home_address)
-
-        # Work address for some customers
-        if customer_id % 2 == 0:
-            # Using the same tuple structure as home_address
-            work_address = (
-                None,
-                customer_id,
-                "work",
-                f"{customer_id*100} Business Ave",
-                f"Suite {customer_id*10}",  # street_line2 has a value
-                "Workville",
-                "OH",
-                f"{customer_id+20000}",
-                "USA",
-                True,
-            )
-            addresses.append(work_address)
-
-    conn.executemany(
-        "INSERT INTO addresses (address_id, customer_id, address_type, street_line1, street_line2, city, state, postal_code, country, is_verified) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-        addresses,
+        for cid in customer_ids
+        if cid % 2 == 0
     )
 
-    # Get address data
-    cursor = conn.cursor()
-    cursor.execute("SELECT address_id, customer_id FROM addresses")
-    address_data = [(row[0], row[1]) for row in cursor.fetchall()]
-    return address_data
+    addresses = list(chain(home_addresses, work_addresses))
+    address_ids = _insert_returning_ids(conn, _SQL_INSERT_ADDRESSES, addresses)
+    return [(address_id, address[1]) for address_id, address in zip(address_ids, addresses)]
 
 
 def _insert_materials_and_inventory(conn: sqlite3.Connection) -> list[int]:
@@ -195,39 +401,21 @@ def _insert_materials_and_inventory(conn: sqlite3.Connection) -> list[int]:
     Returns:
         List of material IDs
     """
-    materials = [
-        (None, "Standard Envelope", "Standard #10 business envelope", 0.05, "each"),
-        (None, "Large Envelope", "9x12 manila envelope", 0.15, "each"),
-        (None, "Standard Paper", "20lb 8.5x11 white paper", 0.02, "sheet"),
-        (None, "Premium Paper", "24lb 8.5x11 ivory paper", 0.04, "sheet"),
-        (None, "Ink - Black", "Black printer ink", 0.10, "page"),
-    ]
-    conn.executemany(
-        "INSERT INTO materials (material_id, name, description, unit_cost, unit_type) VALUES (?, ?, ?, ?, ?)",
-        materials,
+    material_ids = _insert_returning_ids(conn, _SQL_INSERT_MATERIALS, _MATERIALS)
+
+    # Stock every new material, spreading them across warehouses A, B and C
+    placeholders = ", ".join("?" * len(material_ids))
+    conn.execute(
+        f"""
+    INSERT INTO inventory (material_id, quantity, location, last_restock_date)
+    SELECT material_id, n * 1000, 'Warehouse ' || substr('ABC', (n - 1) % 3 + 1, 1), '2025-01-15'
+    FROM (
+        SELECT material_id, ROW_NUMBER() OVER (ORDER BY material_id) AS n
+        FROM materials
+        WHERE material_id IN ({placeholders})
     )
-
-    # Get material IDs
-    cursor = conn.cursor()
-    cursor.execute("SELECT material_id FROM materials")
-    material_ids = [row[0] for row in cursor.fetchall()]
-
-    # Insert inventory
-    inventory = []
-    for i, material_id in enumerate(material_ids):
-        inventory.append(
-            (
-                None,
-                material_id,
-                (i + 1) * 1000,
-                f"Warehouse {chr(65 + i % 3)}",  # A, B, or C
-                "2025-01-15",
-            )
-        )
-
-    conn.executemany(
-        "INSERT INTO inventory (inventory_id, material_id, quantity, location, last_restock_date) VALUES (?, ?, ?, ?, ?)",
-        inventory,
+    """,
+        material_ids,
     )
 
     return material_ids
@@ -242,21 +430,7 @@ def _insert_mailing_lists(conn: sqlite3.Connection) -> list[int]:
     Returns:
         List of mailing list IDs
     """
-    mailing_lists = [
-        (None, "Monthly Newsletter", "Subscribers to monthly newsletter", "admin"),
-        (None, "Special Offers", "Customers interested in special offers", "marketing"),
-        (None, "Product Updates", "Customers interested in product updates", "product"),
-    ]
-    conn.executemany(
-        "INSERT INTO mailing_lists (list_id, name, description, created_by) VALUES (?, ?, ?, ?)",
-        mailing_lists,
-    )
-
-    # Get list IDs
-    cursor = conn.cursor()
-    cursor.execute("SELECT list_id FROM mailing_lists")
-    list_ids = [row[0] for row in cursor.fetchall()]
-    return list_ids
+    return _insert_returning_ids(conn, _SQL_INSERT_MAILING_LISTS, _MAILING_LISTS)
 
 
 def _insert_list_members(conn: sqlite3.Connection, list_ids: list[int], address_data: list[tuple[int, int]]) -> None:
@@ -267,57 +441,65 @@ def _insert_list_members(conn: sqlite3.Connection, list_ids: list[int], address_
         list_ids: List of mailing list IDs
         address_data: List of (address_id, customer_id) tuples
     """
-    list_members = []
-    for list_id in list_ids:
-        for i, (address_id, customer_id) in enumerate(address_data):
-            # Add some customers to each list (not all customers on all lists)
-            if i % len(list_ids) == list_id % len(list_ids):
-                list_members.append((None, list_id, customer_id, address_id, "active"))
-
-    conn.executemany(
-        "INSERT INTO list_members (member_id, list_id, customer_id, address_id, status) VALUES (?, ?, ?, ?, ?)",
-        list_members,
+    # Add some customers to each list (not all customers on all lists): the
+    # address at position i joins the list whose ID matches i modulo the list count
+    list_placeholders = ", ".join("?" * len(list_ids))
+    address_placeholders = ", ".join("?" * len(address_data))
+    conn.execute(
+        f"""
+    INSERT INTO list_members (list_id, customer_id, address_id, status)
+    SELECT l.list_id, a.customer_id, a.address_id, 'active'
+    FROM mailing_lists l
+    JOIN (
+        SELECT address_id, customer_id, ROW_NUMBER() OVER (ORDER BY address_id) - 1 AS position
+        FROM addresses
+        WHERE address_id IN ({address_placeholders})
+    ) a ON a.position % ? = l.list_id % ?
+    WHERE l.list_id IN ({list_placeholders})
+    ORDER BY l.list_id, a.address_id
+    """,
+        [address_id for address_id, _ in address_data] + [len(list_ids), len(list_ids)] + list_ids,
     )
 
 
-def _insert_campaigns(conn: sqlite3.Connection, list_ids: list[int]) -> list[tuple[int, int]]:
-    """Insert sample campaign data and return campaign data.
+def _iter_campaigns(list_ids: list[int]) -> Iterator[tuple]:
+    """Yield sample campaign rows, one per mailing list.
 
     Args:
-        conn: SQLite database connection
         list_ids: List of mailing list IDs
 
-    Returns:
-        List of (campaign_id, list_id) tuples
+    Yields:
+        Campaign rows ready for insertion
     """
-    campaigns = []
     for i, list_id in enumerate(list_ids):
         start_date = f"2025-0{i+1}-01"
         end_date = f"2025-0{i+1}-28"
         status = "active" if i < 2 else "draft"
 
-        campaigns.append(
-            (
-                None,
-                f"Campaign {i+1}",
-                f"Description for campaign {i+1}",
-                list_id,
-                start_date,
-                end_date,
-                status,
-            )
+        yield (
+            None,
+            f"Campaign {i+1}",
+            f"Description for campaign {i+1}",
+            list_id,
+            start_date,
+            end_date,
+            status,
         )
 
-    conn.executemany(
-        "INSERT INTO mailing_campaigns (campaign_id, name, description, list_id, start_date, end_date, status) VALUES (?, ?, ?, ?, ?, ?, ?)",
-        campaigns,
-    )
 
-    # Get campaign IDs and list IDs
-    cursor = conn.cursor()
-    cursor.execute("SELECT campaign_id, list_id FROM mailing_campaigns")
-    campaign_data = [(row[0], row[1]) for row in cursor.fetchall()]
-    return campaign_data
+def _insert_campaigns(conn: sqlite3.Connection, list_ids: list[int]) -> list[tuple[int, int]]:
+    """Insert sample campaign data and return campaign data.
+
+    Args:
+        conn: SQLite database connection
+        list_ids: List of mailing list IDs
+
+    Returns:
+        List of (campaign_id, list_id) tuples
+    """
+    campaigns = list(_iter_campaigns(list_ids))
+    campaign_ids = _insert_returning_ids(conn, _SQL_INSERT_CAMPAIGNS, campaigns)
+    return [(campaign_id, campaign[3]) for campaign_id, campaign in zip(campaign_ids, campaigns)]
 
 
 def _insert_mail_items(conn: sqlite3.Connection, campaign_data: list[tuple[int, int]]) -> list[int]:
@@ -330,38 +512,23 @@ def _insert_mail_items(conn: sqlite3.Connection, campaign_data: list[tuple[int,
     Returns:
         List of mail item IDs
     """
-    mail_items = []
-    cursor = conn.cursor()
-
-    for campaign_id, list_id in campaign_data:
-        # Get members of this list
-        cursor.execute(
-            "SELECT customer_id, address_id FROM list_members WHERE list_id = ?",
-            (list_id,),
-        )
-        members = cursor.fetchall()
-
-        for customer_id, address_id in members:
-            mail_items.append(
-                (
-                    None,
-                    campaign_id,
-                    customer_id,
-                    address_id,
-                    f"template_{campaign_id}",
-                    "pending",
-                )
-            )
-
-    conn.executemany(
-        "INSERT INTO mail_items (item_id, campaign_id, customer_id, address_id, content_template, status) VALUES (?, ?, ?, ?, ?, ?)",
-        mail_items,
+    # Address every member of each campaign's list in a single statement
+    campaign_ids = [campaign_id for campaign_id, _ in campaign_data]
+    placeholders = ", ".join("?" * len(campaign_ids))
+    cursor = conn.execute(
+        f"""
+    INSERT INTO mail_items (campaign_id, customer_id, address_id, content_template, status)
+    SELECT c.campaign_id, lm.customer_id, lm.address_id, 'template_' || c.campaign_id, 'pending'
+    FROM mailing_campaigns c
+    JOIN list_members lm ON lm.list_id = c.list_id
+    WHERE c.campaign_id IN ({placeholders})
+    ORDER BY c.campaign_id, lm.member_id
+    """,
+        campaign_ids,
     )
 
-    # Get mail item IDs
-    cursor.execute("SELECT item_id FROM mail_items")
-    mail_item_ids = [row[0] for row in cursor.fetchall()]
-    return mail_item_ids
+    # Rows from one INSERT get consecutive rowids ending at lastrowid
+    return list(range(cursor.lastrowid - cursor.rowcount + 1, cursor.lastrowid + 1))
 
 
 def _insert_print_jobs_and_queue(conn: sqlite3.Connection, mail_item_ids: list[int]) -> None:
@@ -371,46 +538,28 @@ def _insert_print_jobs_and_queue(conn: sqlite3.Connection, mail_item_ids: list[i
         conn: SQLite database connection
         mail_item_ids: List of mail item IDs
     """
-    print_jobs = [
-        (
-            None,
-            "January Newsletter Batch",
-            "First batch of January newsletter",
-            "queued",
-            "2025-01-10",
-            None,
-            None,
-        ),
-        (
-            None,
-            "Winter Sale Preview",
-            "Preview batch for winter sale",
-            "queued",
-            "2025-01-12",
-            None,
-            None,
-        ),
-    ]
-    conn.executemany(
-        "INSERT INTO print_jobs (job_id, name, description, status, scheduled_date, started_date, completed_date) VALUES (?, ?, ?, ?, ?, ?, ?)",
-        print_jobs,
-    )
-
-    # Get print job IDs
-    cursor = conn.cursor()
-    cursor.execute("SELECT job_id FROM print_jobs")
-    job_ids = [row[0] for row in cursor.fetchall()]
-
-    # Insert print queue
-    print_queue = []
-    for i, item_id in enumerate(mail_item_ids):
-        # Assign items to print jobs
-        job_id = job_ids[i % len(job_ids)]
-        print_queue.append((None, job_id, item_id, i + 1, "queued", None))
-
-    conn.executemany(
-        "INSERT INTO print_queue (queue_id, job_id, item_id, print_order, status, printed_at) VALUES (?, ?, ?, ?, ?, ?)",
-        print_queue,
+    job_ids = _insert_returning_ids(conn, _SQL_INSERT_PRINT_JOBS, _PRINT_JOBS)
+
+    # Insert print queue, assigning items to print jobs round-robin
+    job_placeholders = ", ".join("?" * len(job_ids))
+    item_placeholders = ", ".join("?" * len(mail_item_ids))
+    conn.execute(
+        f"""
+    INSERT INTO print_queue (job_id, item_id, print_order, status)
+    SELECT j.job_id, i.item_id, i.position + 1, 'queued'
+    FROM (
+        SELECT item_id, ROW_NUMBER() OVER (ORDER BY item_id) - 1 AS position
+        FROM mail_items
+        WHERE item_id IN ({item_placeholders})
+    ) i
+    JOIN (
+        SELECT job_id, ROW_NUMBER() OVER (ORDER BY job_id) - 1 AS position
+        FROM print_jobs
+        WHERE job_id IN ({job_placeholders})
+    ) j ON j.position = i.position % ?
+    ORDER BY i.item_id
+    """,
+        mail_item_ids + job_ids + [len(job_ids)],
     )
 
 
@@ -424,36 +573,29 @@ def insert_sample_data(conn: sqlite3.Connection) -> None:
     Args:
         conn: SQLite database connection
     """
-    # List of tables to clear before inserting data
-    tables = [
-        "delivery_tracking",
-        "print_queue",
-        "mail_items",
-        "print_jobs",
-        "mailing_campaigns",
-        "list_members",
-        "mailing_lists",
-        "inventory",
-        "materials",
-        "addresses",
-        "customers",
-    ]
-
     # Clear all tables first
-    _clear_tables(conn, tables)
-
-    # Insert data in the correct order to maintain relationships
-    customer_ids = _insert_customers(conn)
-    address_data = _insert_addresses(conn, customer_ids)
-    _insert_materials_and_inventory(conn)
-    list_ids = _insert_mailing_lists(conn)
-    _insert_list_members(conn, list_ids, address_data)
-    campaign_data = _insert_campaigns(conn, list_ids)
-    mail_item_ids = _insert_mail_items(conn, campaign_data)
-    _insert_print_jobs_and_queue(conn, mail_item_ids)
-
-    # Commit all changes
-    conn.commit()
+    _clear_tables(conn, _SAMPLE_DATA_TABLES)
+
+    # Insert everything in one transaction instead of one per statement batch,
+    # checking foreign keys when it commits rather than after every insert
+    conn.execute("BEGIN")
+    conn.execute("PRAGMA defer_foreign_keys = ON")
+    try:
+        # Insert data in the correct order to maintain relationships
+        customer_ids = _insert_customers(conn)
+        address_data = _insert_addresses(conn, customer_ids)
+        _insert_materials_and_inventory(conn)
+        list_ids = _insert_mailing_lists(conn)
+        _insert_list_members(conn, list_ids, address_data)
+        campaign_data = _insert_campaigns(conn, list_ids)
+        mail_item_ids = _insert_mail_items(conn, campaign_data)
+        _insert_print_jobs_and_queue(conn, mail_item_ids)
+
+        # Commit all changes
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
 
 
 def create_sample_data(db_path: Union[str, Path]) -> None:
@@ -483,39 +625,13 @@ def generate_sample_data_for_tests(conn: sqlite3.Connection, record_count: int =
         conn: SQLite connection (in-memory)
         record_count: Number of records to generate (smaller for faster tests)
     """
-    # Reuse the table clearing function we created earlier
-    tables = [
-        "delivery_tracking",
-        "print_queue",
-        "mail_items",
-        "print_jobs",
-        "mailing_campaigns",
-        "list_members",
-        "mailing_lists",
-        "inventory",
-        "materials",
-        "addresses",
-        "customers",
-    ]
-
     # Clear all tables first
-    _clear_tables(conn, tables)
-
-    # Import the helper functions from sample_data.py
-    from data.sample_data import (
-        generate_and_insert_addresses,
-        generate_and_insert_campaigns,
-        generate_and_insert_customers,
-        generate_and_insert_delivery_tracking,
-        generate_and_insert_inventory,
-        generate_and_insert_list_members,
-        generate_and_insert_mail_items,
-        generate_and_insert_mailing_lists,
-        generate_and_insert_materials,
-        generate_and_insert_print_jobs,
-        generate_and_insert_print_queue,
-    )
+    _clear_tables(conn, _SAMPLE_DATA_TABLES)
 
+    # Insert everything in one transaction instead of one per statement batch,
+    # checking foreign keys when it commits rather than after every insert
+    conn.execute("BEGIN")
+    conn.execute("PRAGMA defer_foreign_keys = ON")
     try:
         # Generate and insert data for each entity type in the correct dependency order
         customer_ids = generate_and_insert_customers(conn, record_count)
@@ -552,9 +668,6 @@ def create_sample_data_legacy(db_path: Union[str, Path]) -> None:
     Returns:
         None: The function creates the database file with sample data as a side effect
     """
-    # Import here to avoid circular imports
-    from data.sample_data import generate_sample_data as gen_sample_data
-
     # Generate the sample data using the imported function
     gen_sample_data(db_path)
     print(f"Sample data created in {db_path}")
@@ -570,10 +683,7 @@ def _insert_migration_test_customers(conn: sqlite3.Connection) -> None:
         (1, "John Smith", "john.smith@example.com", "555-123-4567"),
         (2, "Jane Doe", "jane.doe@example.com", None),  # Missing phone - used to test migrations
     ]
-    conn.executemany(
-        "INSERT INTO customers (customer_id, name, email, phone) VALUES (?, ?, ?, ?)",
-        customers,
-    )
+    conn.executemany(_SQL_INSERT_CUSTOMERS, customers)
 
 
 def _insert_migration_test_addresses(conn: sqlite3.Connection) -> None:
@@ -587,14 +697,29 @@ def _insert_migration_test_addresses(conn: sqlite3.Connection) -> None:
         (1, 1, "home", "123 Main St", None, "Anytown", "oh", "12345", "USA", 1),
         (2, 2, "home", "789 Residential Rd", None, "Hometown", "Oh", "23456", "USA", 1),
     ]
-    conn.executemany(
-        "INSERT INTO addresses (address_id, customer_id, address_type, street_line1, street_line2, city, state, postal_code, country, is_verified) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-        addresses,
-    )
+    conn.executemany(_SQL_INSERT_ADDRESSES, addresses)
+
+
+@pytest.fixture(scope="session")
+def _migration_template() -> Generator[sqlite3.Connection, None, None]:
+    """Build the template database for migration_db once per session."""
+    conn = _open_template("migration_template")
+
+    # Create initial schema
+    create_tables(conn)
+
+    # Insert minimal test data for migrations
+    _insert_migration_test_customers(conn)
+    _insert_migration_test_addresses(conn)
+    conn.commit()
+
+    yield conn
+
+    conn.close()
 
 
 @pytest.fixture(scope="function")
-def migration_db() -> Generator[sqlite3.Connection, None, None]:
+def migration_db(_migration_template) -> Generator[sqlite3.Connection, None, None]:
     """Create an in-memory SQLite database for testing migrations.
 
     This fixture creates a minimal database with specific test data designed
@@ -604,15 +729,8 @@ def migration_db() -> Generator[sqlite3.Connection, None, None]:
     Yields:
         sqlite3.Connection: An in-memory SQLite database connection with test data
     """
-    # Create in-memory database
-    conn = get_connection(":memory:", in_memory=True)
-
-    # Create initial schema
-    create_tables(conn)
-
-    # Insert minimal test data for migrations
-    _insert_migration_test_customers(conn)
-    _insert_migration_test_addresses(conn)
+    # Copy the session template into a fresh in-memory database
+    conn = _clone_connection(_migration_template)
 
     # Yield the connection to the test
     yield conn
@@ -4,13 +4,28 @@ PyTest plugin for multi-database testing.
 This module registers command-line options and fixtures for multi-database testing.
 """
 import sqlite3
-from typing import Generator, Union
+from typing import Generator, Optional, Union
 
 import psycopg2
 import pytest
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.extras import execute_values
 
-from src.database.db_interface import DatabaseInterface, get_db_interface
+from src.database.db_interface import DatabaseInterface, SQLiteInterface, get_db_interface
+from src.database.postgres_procedures import create_stored_procedures
 from src.database.schema_manager import get_schema_manager
+from tests.test_data_helper import (
+    insert_addresses,
+    insert_campaigns,
+    insert_inventory,
+    insert_list_members,
+    insert_mail_items,
+    insert_mailing_lists,
+    insert_materials,
+    insert_print_jobs,
+    insert_print_queue,
+    insert_test_data,
+)
 
 
 def pytest_addoption(parser):
@@ -68,22 +83,26 @@ def db_type(request):
 
 @pytest.fixture(scope="session")
 def pg_config(request):
-    """Get PostgreSQL configuration from command line options."""
+    """Get PostgreSQL configuration from command line options.
+
+    When running under pytest-xdist, each worker gets a schema of its own so
+    the workers can share one database without touching each other's tables.
+    """
+    workerinput = getattr(request.config, "workerinput", None)
     return {
         "host": request.config.getoption("--pg-host"),
         "port": request.config.getoption("--pg-port"),
         "user": request.config.getoption("--pg-user"),
         "password": request.config.getoption("--pg-password"),
         "dbname": request.config.getoption("--pg-dbname"),
+        "schema": f"test_{workerinput['workerid']}" if workerinput else None,
     }
 
 
-@pytest.fixture(scope="function")
-def db_interface(db_type, pg_config) -> Generator[DatabaseInterface, None, None]:
+def _create_db_interface(db_type: str, pg_config: dict) -> DatabaseInterface:
     """
-    Create a database interface for testing.
+    Create an unconnected database interface for the given database type.
 
-    This fixture creates a database interface based on the specified database type.
     For SQLite, it creates an in-memory database.
     For PostgreSQL, it connects to the specified database.
 
@@ -91,32 +110,58 @@ def db_interface(db_type, pg_config) -> Generator[DatabaseInterface, None, None]
         db_type: Database type ('sqlite' or 'postgres')
         pg_config: PostgreSQL configuration
 
-    Yields:
-        DatabaseInterface: A database interface for testing
+    Returns:
+        DatabaseInterface: The database interface
     """
     if db_type.lower() == "sqlite":
         # Create an in-memory SQLite database
-        db = get_db_interface("sqlite", db_path=":memory:", in_memory=True)
+        return get_db_interface("sqlite", db_path=":memory:", in_memory=True)
     elif db_type.lower() in ("postgres", "postgresql"):
         # Create a PostgreSQL database
-        db = get_db_interface("postgres", **pg_config)
+        return get_db_interface("postgres", **pg_config)
     else:
         raise ValueError(f"Unsupported database type: {db_type}")
 
-    # Connect to the database
+
+@pytest.fixture(scope="session")
+def _db_schema(db_type, pg_config) -> Generator[DatabaseInterface, None, None]:
+    """
+    Create the database schema once per test session.
+
+    For SQLite, the schema is built in an in-memory database that each test
+    copies. For PostgreSQL, the tables are created once in the test database
+    and dropped when the session ends.
+
+    Args:
+        db_type: Database type ('sqlite' or 'postgres')
+        pg_config: PostgreSQL configuration
+
+    Yields:
+        DatabaseInterface: The database interface the schema was created with
+    """
+    db = _create_db_interface(db_type, pg_config)
     db.connect()
 
+    # Create this worker's PostgreSQL schema, if it has one
+    if not isinstance(db, SQLiteInterface) and pg_config["schema"]:
+        db.execute(f"CREATE SCHEMA IF NOT EXISTS {pg_config['schema']}")
+
     # Create the schema
     schema_manager = get_schema_manager(db)
     schema_manager.create_tables()
 
-    # Yield the database interface to the test
     yield db
 
-    # Clean up after the test
+    # Clean up after the session
     try:
-        # Drop all tables
-        schema_manager.drop_tables()
+        if not isinstance(db, SQLiteInterface):
+            # Drop all tables
+            schema_manager.drop_tables()
+
+            # Drop this worker's schema along with anything else left in it
+            if pg_config["schema"]:
+                db.execute(f"DROP SCHEMA IF EXISTS {pg_config['schema']} CASCADE")
+                db.commit()
     except Exception as e:
         # If an error occurs, try to rollback the transaction
         if hasattr(db, "connection") and db.connection is not None:
@@ -128,6 +173,107 @@ def db_interface(db_type, pg_config) -> Generator[DatabaseInterface, None, None]
         db.close()
 
 
+# Savepoint standing in for COMMIT while a PostgreSQL test runs
+_TEST_SAVEPOINT = "test_commit"
+
+
+def _begin_test_transaction(db: DatabaseInterface) -> None:
+    """
+    Run the rest of a test inside a transaction that is never committed.
+
+    The interface's commit() and rollback() are replaced on the instance, so
+    code under test that commits only marks a savepoint to roll back to.
+
+    Args:
+        db: Database interface the test uses
+    """
+    conn = db.connection
+
+    def commit() -> None:
+        # Savepoints with the same name stack, so the latest one is the commit point
+        with conn.cursor() as cursor:
+            cursor.execute(f"SAVEPOINT {_TEST_SAVEPOINT}")
+
+    def rollback() -> None:
+        # With no transaction open, a failed statement has already rolled everything back
+        if conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            with conn.cursor() as cursor:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {_TEST_SAVEPOINT}")
+
+    # psycopg2 opens the transaction implicitly with the first statement
+    commit()
+    db.commit = commit
+    db.rollback = rollback
+
+
+def _end_test_transaction(db: DatabaseInterface) -> None:
+    """
+    Roll back a test's transaction and restore the interface's own commit() and rollback().
+
+    Args:
+        db: Database interface the test used
+    """
+    del db.commit
+    del db.rollback
+    db.rollback()
+
+
+@pytest.fixture(scope="function")
+def db_interface(db_type, pg_config, _db_schema) -> Generator[DatabaseInterface, None, None]:
+    """
+    Create a database interface for testing.
+
+    This fixture creates a database interface based on the specified database type,
+    using the schema created once per session. For SQLite, each test gets a copy
+    of the session's in-memory database. For PostgreSQL, each test reuses the
+    session's connection and runs inside one transaction that is rolled back
+    afterwards: commit() only sets a savepoint and rollback() returns to the
+    last one, so nothing the test writes is ever committed or needs deleting.
+    A statement that fails inside the interface still rolls back the whole
+    transaction, including the test's earlier "commits".
+
+    Args:
+        db_type: Database type ('sqlite' or 'postgres')
+        pg_config: PostgreSQL configuration
+        _db_schema: Database interface the session schema was created with
+
+    Yields:
+        DatabaseInterface: A database interface for testing
+    """
+    if isinstance(_db_schema, SQLiteInterface):
+        db = _create_db_interface(db_type, pg_config)
+
+        # Connect to the database
+        db.connect()
+
+        # Copy the session schema into this test's in-memory database
+        _db_schema.connection.backup(db.connection)
+    else:
+        # Reuse the session's connection rather than reconnecting for every test
+        db = _db_schema
+        _begin_test_transaction(db)
+
+    # Yield the database interface to the test
+    yield db
+
+    # Clean up after the test
+    try:
+        if not isinstance(db, SQLiteInterface):
+            # Roll back everything the test did, "committed" or not
+            _end_test_transaction(db)
+    except Exception as e:
+        # If an error occurs, try to rollback the transaction
+        if hasattr(db, "connection") and db.connection is not None:
+            if hasattr(db.connection, "rollback"):
+                db.connection.rollback()
+        print(f"Error during cleanup: {e}")
+    finally:
+        # Close this test's SQLite copy; the PostgreSQL connection is closed
+        # with the session
+        if isinstance(db, SQLiteInterface):
+            db.close()
+
+
 @pytest.fixture(scope="function")
 def db_connection(db_interface) -> Generator[Union[sqlite3.Connection, psycopg2.extensions.connection], None, None]:
     """
@@ -162,8 +308,39 @@ def enable_postgres_tests(request) -> bool:
     return request.config.getoption("--enable-postgres-tests")
 
 
+@pytest.fixture(scope="session")
+def _sample_data_db(_db_schema) -> Generator[Optional[DatabaseInterface], None, None]:
+    """
+    Load the SQLite sample data once per test session.
+
+    The data is inserted into a copy of the session's in-memory schema, which
+    sample_data then copies into each test's database. PostgreSQL tests insert
+    their data per test, so nothing is built for them.
+
+    Args:
+        _db_schema: Database interface the session schema was created with
+
+    Yields:
+        DatabaseInterface: The database with the sample data, or None for PostgreSQL
+    """
+    if not isinstance(_db_schema, SQLiteInterface):
+        yield None
+        return
+
+    db = get_db_interface("sqlite", db_path=":memory:", in_memory=True)
+    db.connect()
+
+    # Start from the session schema and load the sample data into it
+    _db_schema.connection.backup(db.connection)
+    insert_test_data(db)
+
+    yield db
+
+    db.close()
+
+
 @pytest.fixture(scope="function")
-def sample_data(db_interface):
+def sample_data(db_interface, _sample_data_db):
     """
     Insert sample data into the database.
 
@@ -171,6 +348,7 @@ def sample_data(db_interface):
 
     Args:
         db_interface: Database interface
+        _sample_data_db: Session database with the SQLite sample data loaded
 
     Returns:
         None
@@ -180,14 +358,10 @@ def sample_data(db_interface):
     db_type_value = db_interface.__class__.__name__
 
     if db_type_value == "PostgreSQLInterface":
-        # For PostgreSQL, we need to handle the schema creation and data insertion differently
-        # First, make sure the schema is created
-        from src.database.schema_manager import get_schema_manager
-
-        schema_manager = get_schema_manager(db_interface)
-        schema_manager.create_tables()
-
-        # Then insert data using PostgreSQL-compatible SQL
+        # For PostgreSQL, the tables already exist from _db_schema, so insert the
+        # data into them using PostgreSQL-compatible SQL. This runs inside the
+        # test's rolled-back transaction, so tests without sample_data still
+        # start from empty tables
         # Insert customers without specifying customer_id
         customers = [
             ("John Smith", "john.smith@example.com", "555-123-4567"),
@@ -197,27 +371,17 @@ def sample_data(db_interface):
             ("Charlie Davis", "charlie.davis@example.com", "555-321-6540"),
         ]
 
-        for customer in customers:
-            db_interface.execute("INSERT INTO customers (name, email, phone) VALUES (%s, %s, %s)", customer)
-
-        # Get customer IDs
-        results = db_interface.query("SELECT customer_id FROM customers")
-        customer_ids = [row["customer_id"] for row in results]
+        # Insert all customers in one statement and read their IDs back from it
+        with db_interface.connection.cursor() as cursor:
+            results = execute_values(
+                cursor,
+                "INSERT INTO customers (name, email, phone) VALUES %s RETURNING customer_id",
+                customers,
+                fetch=True,
+            )
+        customer_ids = [row[0] for row in results]
 
         # Continue with the rest of the data insertion using test_data_helper functions
-        from tests.test_data_helper import (
-            insert_addresses,
-            insert_campaigns,
-            insert_inventory,
-            insert_list_members,
-            insert_mail_items,
-            insert_mailing_lists,
-            insert_materials,
-            insert_print_jobs,
-            insert_print_queue,
-        )
-
-        # Insert the rest of the data
         address_data = insert_addresses(db_interface, customer_ids)
         material_ids = insert_materials(db_interface)
         insert_inventory(db_interface, material_ids)
@@ -228,10 +392,8 @@ def sample_data(db_interface):
         job_ids = insert_print_jobs(db_interface)
         insert_print_queue(db_interface, job_ids, mail_item_ids)
     else:
-        # For SQLite, use the existing test_data_helper
-        from tests.test_data_helper import insert_test_data
-
-        insert_test_data(db_interface)
+        # For SQLite, copy the session's sample data rather than inserting it again
+        _sample_data_db.connection.backup(db_interface.connection)
 
     return None
 
@@ -241,18 +403,27 @@ def is_postgres(db_interface):
     return hasattr(db_interface.connection, "__module__") and "psycopg2" in db_interface.connection.__module__
 
 
-def pytest_runtest_setup(item):
-    """Skip tests marked with postgres_only when running with SQLite."""
-    if "postgres_only" in item.keywords:
-        db_type = item.config.getoption("--db-type")
-        if db_type.lower() != "postgres" and db_type.lower() != "postgresql":
-            pytest.skip("Test requires PostgreSQL")
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked with postgres_only unless PostgreSQL tests are enabled.
 
+    The skip marker is added at collection time, so skipped tests never set up
+    their fixtures.
+    """
+    db_type = config.getoption("--db-type").lower()
+    if db_type != "postgres" and db_type != "postgresql":
+        skip = pytest.mark.skip(reason="Test requires PostgreSQL")
+    elif not config.getoption("--enable-postgres-tests"):
+        skip = pytest.mark.skip(reason="Use --enable-postgres-tests to run this test")
+    else:
+        return
 
-@pytest.fixture(scope="function")
-def postgres_procedures(db_interface):
-    """Create PostgreSQL stored procedures for testing."""
-    if is_postgres(db_interface):
-        from src.database.postgres_procedures import create_stored_procedures
+    for item in items:
+        if "postgres_only" in item.keywords:
+            item.add_marker(skip)
 
-        create_stored_procedures(db_interface)
+
+@pytest.fixture(scope="session")
+def postgres_procedures(_db_schema):
+    """Create PostgreSQL stored procedures once for the test session."""
+    if is_postgres(_db_schema):
+        create_stored_procedures(_db_schema)
@@ -4,13 +4,97 @@ Test data helper for multi-database testing.
 This module provides functions to insert test data into different database types
 using the database interface abstraction.
 """
-from typing import List, Optional, Tuple
+from itertools import chain
+from typing import Any, Dict, List, Optional, Tuple
+
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
 
 from src.database.db_interface import DatabaseInterface
+from src.database.schema_manager import TABLES, sqlite_clear_statements
 
-# Define the type for address tuples to match conftest.py
+# Define the type for address tuples
 AddressTuple = Tuple[Optional[int], int, str, str, Optional[str], str, str, str, str, bool]
 
+# INSERT statement per table for each database interface, with the columns of
+# each row to bind: PostgreSQL generates primary keys, so its statements leave
+# out the first column, while SQLite binds it (NULL to auto-generate)
+_INSERT_STATEMENTS: Dict[str, Tuple[Dict[str, str], slice]] = {
+    "PostgreSQLInterface": (
+        {
+            "customers": "INSERT INTO customers (name, email, phone) VALUES (%s, %s, %s)",
+            "addresses": (
+                "INSERT INTO addresses (customer_id, address_type, street_line1, street_line2, city, state, "
+                "postal_code, country, is_verified) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)"
+            ),
+            "materials": "INSERT INTO materials (name, description, unit_cost, unit_type) VALUES (%s, %s, %s, %s)",
+            "inventory": (
+                "INSERT INTO inventory (material_id, quantity, location, last_restock_date) VALUES (%s, %s, %s, %s)"
+            ),
+            "mailing_lists": "INSERT INTO mailing_lists (name, description, created_by) VALUES (%s, %s, %s)",
+            "list_members": (
+                "INSERT INTO list_members (list_id, customer_id, address_id, status) VALUES (%s, %s, %s, %s)"
+            ),
+            "mailing_campaigns": (
+                "INSERT INTO mailing_campaigns (name, description, list_id, start_date, end_date, status) "
+                "VALUES (%s, %s, %s, %s, %s, %s)"
+            ),
+            "mail_items": (
+                "INSERT INTO mail_items (campaign_id, customer_id, address_id, content_template, status) "
+                "VALUES (%s, %s, %s, %s, %s)"
+            ),
+            "print_jobs": (
+                "INSERT INTO print_jobs (name, description, status, scheduled_date, started_date, completed_date) "
+                "VALUES (%s, %s, %s, %s, %s, %s)"
+            ),
+            "print_queue": (
+                "INSERT INTO print_queue (job_id, item_id, print_order, status, printed_at) VALUES (%s, %s, %s, %s, %s)"
+            ),
+        },
+        slice(1, None),
+    ),
+    "SQLiteInterface": (
+        {
+            "customers": "INSERT INTO customers (customer_id, name, email, phone) VALUES (%s, %s, %s, %s)",
+            "addresses": (
+                "INSERT INTO addresses (address_id, customer_id, address_type, street_line1, street_line2, city, "
+                "state, postal_code, country, is_verified) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+            ),
+            "materials": (
+                "INSERT INTO materials (material_id, name, description, unit_cost, unit_type) "
+                "VALUES (%s, %s, %s, %s, %s)"
+            ),
+            "inventory": (
+                "INSERT INTO inventory (inventory_id, material_id, quantity, location, last_restock_date) "
+                "VALUES (%s, %s, %s, %s, %s)"
+            ),
+            "mailing_lists": (
+                "INSERT INTO mailing_lists (list_id, name, description, created_by) VALUES (%s, %s, %s, %s)"
+            ),
+            "list_members": (
+                "INSERT INTO list_members (member_id, list_id, customer_id, address_id, status) "
+                "VALUES (%s, %s, %s, %s, %s)"
+            ),
+            "mailing_campaigns": (
+                "INSERT INTO mailing_campaigns (campaign_id, name, description, list_id, start_date, end_date, status) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s)"
+            ),
+            "mail_items": (
+                "INSERT INTO mail_items (item_id, campaign_id, customer_id, address_id, content_template, status) "
+                "VALUES (%s, %s, %s, %s, %s, %s)"
+            ),
+            "print_jobs": (
+                "INSERT INTO print_jobs (job_id, name, description, status, scheduled_date, started_date, "
+                "completed_date) VALUES (%s, %s, %s, %s, %s, %s, %s)"
+            ),
+            "print_queue": (
+                "INSERT INTO print_queue (queue_id, job_id, item_id, print_order, status, printed_at) "
+                "VALUES (%s, %s, %s, %s, %s, %s)"
+            ),
+        },
+        slice(None),
+    ),
+}
+
 
 def insert_test_data(db: DatabaseInterface) -> None:
     """
@@ -23,64 +107,128 @@ def insert_test_data(db: DatabaseInterface) -> None:
     Args:
         db: Database interface
     """
-    # Clear any existing data first
-    clear_tables(db)
+    # Clear and reload everything in one transaction that is rolled back as a
+    # whole on failure; psycopg2 opens it implicitly, so only SQLite needs BEGIN.
+    # If the caller already has a transaction open, work inside a savepoint and
+    # leave committing or rolling back the caller's work to the caller.
+    owns_transaction = not _in_transaction(db)
+    if not owns_transaction:
+        db.execute("SAVEPOINT insert_test_data")
+    elif db.__class__.__name__ != "PostgreSQLInterface":
+        db.execute("BEGIN")
+
+    try:
+        # Clear any existing data first
+        clear_tables(db)
+
+        # Insert data in the correct order to maintain relationships
+        customer_ids = insert_customers(db)
+        address_data = insert_addresses(db, customer_ids)
+        material_ids = insert_materials(db)
+        insert_inventory(db, material_ids)
+        list_ids = insert_mailing_lists(db)
+        insert_list_members(db, list_ids, address_data)
+        campaign_data = insert_campaigns(db, list_ids)
+        mail_item_ids = insert_mail_items(db, campaign_data)
+        job_ids = insert_print_jobs(db)
+        insert_print_queue(db, job_ids, mail_item_ids)
+
+        # Commit all changes, or fold them into the caller's transaction
+        if owns_transaction:
+            db.commit()
+        else:
+            db.execute("RELEASE SAVEPOINT insert_test_data")
+    except Exception:
+        if owns_transaction:
+            db.rollback()
+        elif _in_transaction(db):
+            # PostgreSQLInterface rolls back the whole transaction itself when a
+            # statement fails, taking the savepoint with it
+            db.execute("ROLLBACK TO SAVEPOINT insert_test_data")
+            db.execute("RELEASE SAVEPOINT insert_test_data")
+        raise
+
+
+def _in_transaction(db: DatabaseInterface) -> bool:
+    """
+    Check whether the database connection has a transaction open.
 
-    # Insert data in the correct order to maintain relationships
-    customer_ids = insert_customers(db)
-    address_data = insert_addresses(db, customer_ids)
-    material_ids = insert_materials(db)
-    insert_inventory(db, material_ids)
-    list_ids = insert_mailing_lists(db)
-    insert_list_members(db, list_ids, address_data)
-    campaign_data = insert_campaigns(db, list_ids)
-    mail_item_ids = insert_mail_items(db, campaign_data)
-    job_ids = insert_print_jobs(db)
-    insert_print_queue(db, job_ids, mail_item_ids)
+    Args:
+        db: Database interface
 
-    # Commit all changes
-    db.commit()
+    Returns:
+        True if a transaction is open
+    """
+    if db.__class__.__name__ == "PostgreSQLInterface":
+        return db.connection.info.transaction_status != TRANSACTION_STATUS_IDLE
+    return db.connection.in_transaction
 
 
 def clear_tables(db: DatabaseInterface) -> None:
     """
-    Clear all data from the specified tables.
+    Clear all data from the database tables and reset their generated IDs.
+
+    The statements run in the caller's transaction, so they are committed or
+    rolled back together with whatever the caller does next.
 
     Args:
         db: Database interface
     """
-    tables = [
-        "delivery_tracking",
-        "print_queue",
-        "mail_items",
-        "print_jobs",
-        "mailing_campaigns",
-        "list_members",
-        "mailing_lists",
-        "inventory",
-        "materials",
-        "addresses",
-        "customers",
-    ]
-
     # SQLite-specific handling
     if hasattr(db.connection, "__module__") and "sqlite3" in db.connection.__module__:
-        # Disable foreign key constraints temporarily for clean deletion
-        db.execute("PRAGMA foreign_keys = OFF")
+        # Tables are listed children first, so the deletes never violate a
+        # foreign key; the counters are reset with a single statement
+        for statement in sqlite_clear_statements(tuple(TABLES)):
+            db.execute(statement)
+    else:
+        # PostgreSQL handling: a single TRUNCATE covers every table
+        db.execute(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE")
 
-        for table in tables:
-            db.execute(f"DELETE FROM {table}")
 
-        # Reset auto-increment counters
-        for table in tables:
-            db.execute(f"DELETE FROM sqlite_sequence WHERE name='{table}'")
+def _insert_statement(
+    db: DatabaseInterface, table: str, rows: List[Tuple[Any, ...]]
+) -> Tuple[str, List[Tuple[Any, ...]]]:
+    """
+    Look up the INSERT statement for a table and the parameters to bind to it.
 
-        # Re-enable foreign key constraints
-        db.execute("PRAGMA foreign_keys = ON")
-    else:
-        # PostgreSQL handling
-        for table in tables:
-            db.execute(f"TRUNCATE TABLE {table} RESTART IDENTITY CASCADE")
+    Every row starts with its primary key, which is only bound on databases
+    that do not generate it themselves. Interfaces other than PostgreSQL are
+    treated as SQLite.
+
+    Args:
+        db: Database interface
+        table: Name of the table to insert into
+        rows: List of parameter tuples, one per row, primary key first
+
+    Returns:
+        Tuple of (INSERT statement, parameter tuples)
+    """
+    statements, columns = _INSERT_STATEMENTS.get(type(db).__name__, _INSERT_STATEMENTS["SQLiteInterface"])
+    return statements[table], [row[columns] for row in rows]
+
+
+def _insert_returning(
+    db: DatabaseInterface, query: str, rows: List[Tuple[Any, ...]], returning: str
+) -> List[Dict[str, Any]]:
+    """
+    Insert rows with one multi-row INSERT and return the generated columns.
+
+    Both SQLite and PostgreSQL support RETURNING, so the generated IDs come
+    back with the write instead of needing a second query.
+
+    Args:
+        db: Database interface
+        query: INSERT statement ending in a single-row VALUES clause
+        rows: List of parameter tuples, one per row
+        returning: Columns to return for each inserted row
+
+    Returns:
+        One dictionary per inserted row, in no particular order
+    """
+    head, values = query.rsplit("VALUES", 1)
+    placeholders = ", ".join([values.strip()] * len(rows))
+    params = tuple(chain.from_iterable(rows))
+    return db.query(f"{head}VALUES {placeholders} RETURNING {returning}", params)
 
 
 def insert_customers(db: DatabaseInterface) -> List[int]:
@@ -101,21 +249,12 @@ def insert_customers(db: DatabaseInterface) -> List[int]:
         (None, "Charlie Davis", "charlie.davis@example.com", "555-321-6540"),
     ]
 
-    # Insert customers - handle different database types
-    db_type = db.__class__.__name__
+    # Insert customers in one batch
+    sql, params = _insert_statement(db, "customers", customers)
+    results = _insert_returning(db, sql, params, "customer_id")
 
-    for customer in customers:
-        if db_type == "PostgreSQLInterface":
-            # For PostgreSQL, let the database generate the customer_id
-            _, name, email, phone = customer
-            db.execute("INSERT INTO customers (name, email, phone) VALUES (%s, %s, %s)", (name, email, phone))
-        else:
-            # For SQLite, use the provided customer_id (or NULL to auto-generate)
-            db.execute("INSERT INTO customers (customer_id, name, email, phone) VALUES (%s, %s, %s, %s)", customer)
-
-    # Get customer IDs - query approach works for both SQLite and PostgreSQL
-    results = db.query("SELECT customer_id FROM customers")
-    customer_ids = [row["customer_id"] for row in results]
+    # Get customer IDs from the returned rows, in insertion order
+    customer_ids = sorted(row["customer_id"] for row in results)
     return customer_ids
 
 
@@ -130,82 +269,38 @@ def insert_addresses(db: DatabaseInterface, customer_ids: List[int]) -> List[Tup
     Returns:
         List of (address_id, customer_id) tuples
     """
-    addresses: List[AddressTuple] = []
+    # Home address for every customer
+    home_addresses: List[AddressTuple] = [
+        (None, cid, "home", f"{cid*123} Main St", None, "Anytown", "OH", f"{cid+10000}", "USA", True)
+        for cid in customer_ids
+    ]
 
-    for customer_id in customer_ids:
-        # Home address for every customer
-        home_address = (
+    # Work address for some customers
+    work_addresses: List[AddressTuple] = [
+        (
             None,
-            customer_id,
-            "home",
-            f"{customer_id*123} Main St",
-            None,  # street_line2 can be None
-            "Anytown",
+            cid,
+            "work",
+            f"{cid*100} Business Ave",
+            f"Suite {cid*10}",
+            "Workville",
             "OH",
-            f"{customer_id+10000}",
+            f"{cid+20000}",
             "USA",
-            True,  # is_verified is boolean
+            True,
         )
-        addresses.append(home_address)
-
-        # Work address for some customers
-        if customer_id % 2 == 0:
-            work_address = (
-                None,
-                customer_id,
-                "work",
-                f"{customer_id*100} Business Ave",
-                f"Suite {customer_id*10}",  # street_line2 has a value
-                "Workville",
-                "OH",
-                f"{customer_id+20000}",
-                "USA",
-                True,  # is_verified is boolean
-            )
-            addresses.append(work_address)
-
-    # Insert addresses - handle different database types
-    db_type = db.__class__.__name__
-
-    for address in addresses:
-        if db_type == "PostgreSQLInterface":
-            # For PostgreSQL, let the database generate the address_id
-            (
-                _,
-                customer_id,
-                address_type,
-                street_line1,
-                street_line2,
-                city,
-                state,
-                postal_code,
-                country,
-                is_verified,
-            ) = address
-            db.execute(
-                """
-                INSERT INTO addresses
-                (customer_id, address_type, street_line1, street_line2,
-                 city, state, postal_code, country, is_verified)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (customer_id, address_type, street_line1, street_line2, city, state, postal_code, country, is_verified),
-            )
-        else:
-            # For SQLite, use the provided address_id (or NULL to auto-generate)
-            db.execute(
-                """
-                INSERT INTO addresses
-                (address_id, customer_id, address_type, street_line1, street_line2,
-                 city, state, postal_code, country, is_verified)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                address,
-            )
+        for cid in customer_ids
+        if cid % 2 == 0
+    ]
+
+    addresses = home_addresses + work_addresses
+
+    # Insert addresses in one batch
+    sql, params = _insert_statement(db, "addresses", addresses)
+    results = _insert_returning(db, sql, params, "address_id, customer_id")
 
     # Get address data
-    results = db.query("SELECT address_id, customer_id FROM addresses")
-    address_data = [(row["address_id"], row["customer_id"]) for row in results]
+    address_data = sorted((row["address_id"], row["customer_id"]) for row in results)
     return address_data
 
 
@@ -227,27 +322,12 @@ def insert_materials(db: DatabaseInterface) -> List[int]:
         (None, "Ink - Black", "Black printer ink", 0.10, "page"),
     ]
 
-    # Insert materials - handle different database types
-    db_type = db.__class__.__name__
-
-    for material in materials:
-        if db_type == "PostgreSQLInterface":
-            # For PostgreSQL, let the database generate the material_id
-            _, name, description, unit_cost, unit_type = material
-            db.execute(
-                "INSERT INTO materials (name, description, unit_cost, unit_type) VALUES (%s, %s, %s, %s)",
-                (name, description, unit_cost, unit_type),
-            )
-        else:
-            # For SQLite, use the provided material_id (or NULL to auto-generate)
-            db.execute(
-                "INSERT INTO materials (material_id, name, description, unit_cost, unit_type) VALUES (%s, %s, %s, %s, %s)",
-                material,
-            )
+    # Insert materials in one batch
+    sql, params = _insert_statement(db, "materials", materials)
+    results = _insert_returning(db, sql, params, "material_id")
 
     # Get material IDs
-    results = db.query("SELECT material_id FROM materials")
-    material_ids = [row["material_id"] for row in results]
+    material_ids = sorted(row["material_id"] for row in results)
     return material_ids
 
 
@@ -259,39 +339,20 @@ def insert_inventory(db: DatabaseInterface, material_ids: List[int]) -> None:
         db: Database interface
         material_ids: List of material IDs
     """
-    for i, material_id in enumerate(material_ids):
-        inventory_item = (
+    inventory_items = [
+        (
             None,
             material_id,
             (i + 1) * 1000,
             f"Warehouse {chr(65 + i % 3)}",  # A, B, or C
             "2025-01-15",  # last_restock_date
         )
+        for i, material_id in enumerate(material_ids)
+    ]
 
-        # Handle different database types
-        db_type = db.__class__.__name__
-
-        if db_type == "PostgreSQLInterface":
-            # For PostgreSQL, let the database generate the inventory_id
-            _, material_id, quantity, location, last_restock_date = inventory_item
-            db.execute(
-                """
-                INSERT INTO inventory
-                (material_id, quantity, location, last_restock_date)
-                VALUES (%s, %s, %s, %s)
-                """,
-                (material_id, quantity, location, last_restock_date),
-            )
-        else:
-            # For SQLite, use the provided inventory_id (or NULL to auto-generate)
-            db.execute(
-                """
-                INSERT INTO inventory
-                (inventory_id, material_id, quantity, location, last_restock_date)
-                VALUES (%s, %s, %s, %s, %s)
-                """,
-                inventory_item,
-            )
+    # Insert inventory in one batch
+    sql, params = _insert_statement(db, "inventory", inventory_items)
+    db.execute_many(sql, params)
 
 
 def insert_mailing_lists(db: DatabaseInterface) -> List[int]:
@@ -310,27 +371,12 @@ def insert_mailing_lists(db: DatabaseInterface) -> List[int]:
         (None, "Product Updates", "Customers interested in product updates", "product"),
     ]
 
-    # Insert mailing lists - handle different database types
-    db_type = db.__class__.__name__
-
-    for mailing_list in mailing_lists:
-        if db_type == "PostgreSQLInterface":
-            # For PostgreSQL, let the database generate the list_id
-            _, name, description, created_by = mailing_list
-            db.execute(
-                "INSERT INTO mailing_lists (name, description, created_by) VALUES (%s, %s, %s)",
-                (name, description, created_by),
-            )
-        else:
-            # For SQLite, use the provided list_id (or NULL to auto-generate)
-            db.execute(
-                "INSERT INTO mailing_lists (list_id, name, description, created_by) VALUES (%s, %s, %s, %s)",
-                mailing_list,
-            )
+    # Insert mailing lists in one batch
+    sql, params = _insert_statement(db, "mailing_lists", mailing_lists)
+    results = _insert_returning(db, sql, params, "list_id")
 
     # Get list IDs
-    results = db.query("SELECT list_id FROM mailing_lists")
-    list_ids = [row["list_id"] for row in results]
+    list_ids = sorted(row["list_id"] for row in results)
     return list_ids
 
 
@@ -343,42 +389,17 @@ def insert_list_members(db: DatabaseInterface, list_ids: List[int], address_data
         list_ids: List of mailing list IDs
         address_data: List of (address_id, customer_id) tuples
     """
-    for list_id in list_ids:
-        for i, (address_id, customer_id) in enumerate(address_data):
-            # Add some customers to each list (not all customers on all lists)
-            if i % len(list_ids) == list_id % len(list_ids):
-                list_member = (
-                    None,
-                    list_id,
-                    customer_id,
-                    address_id,
-                    "active",
-                )
-
-                # Handle different database types
-                db_type = db.__class__.__name__
-
-                if db_type == "PostgreSQLInterface":
-                    # For PostgreSQL, let the database generate the member_id
-                    _, list_id, customer_id, address_id, status = list_member
-                    db.execute(
-                        """
-                        INSERT INTO list_members
-                        (list_id, customer_id, address_id, status)
-                        VALUES (%s, %s, %s, %s)
-                        """,
-                        (list_id, customer_id, address_id, status),
-                    )
-                else:
-                    # For SQLite, use the provided member_id (or NULL to auto-generate)
-                    db.execute(
-                        """
-                        INSERT INTO list_members
-                        (member_id, list_id, customer_id, address_id, status)
-                        VALUES (%s, %s, %s, %s, %s)
-                        """,
-                        list_member,
-                    )
+    # Add some customers to each list (not all customers on all lists)
+    list_members = [
+        (None, list_id, customer_id, address_id, "active")
+        for list_id in list_ids
+        for i, (address_id, customer_id) in enumerate(address_data)
+        if i % len(list_ids) == list_id % len(list_ids)
+    ]
+
+    # Insert list members in one batch
+    sql, params = _insert_statement(db, "list_members", list_members)
+    db.execute_many(sql, params)
 
 
 def insert_campaigns(db: DatabaseInterface, list_ids: List[int]) -> List[Tuple[int, int]]:
@@ -392,52 +413,26 @@ def insert_campaigns(db: DatabaseInterface, list_ids: List[int]) -> List[Tuple[i
     Returns:
         List of (campaign_id, list_id) tuples
     """
-    campaign_ids = []
-
-    for i, list_id in enumerate(list_ids):
-        start_date = f"2025-0{i+1}-01"
-        end_date = f"2025-0{i+1}-28"
-        status = "active" if i < 2 else "draft"
-
-        campaign = (
+    campaigns = [
+        (
             None,
             f"Campaign {i+1}",
             f"Description for campaign {i+1}",
             list_id,
-            start_date,
-            end_date,
-            status,
+            f"2025-0{i+1}-01",  # start_date
+            f"2025-0{i+1}-28",  # end_date
+            "active" if i < 2 else "draft",  # status
         )
+        for i, list_id in enumerate(list_ids)
+    ]
 
-        # Handle different database types
-        db_type = db.__class__.__name__
-
-        if db_type == "PostgreSQLInterface":
-            # For PostgreSQL, let the database generate the campaign_id
-            _, name, description, list_id, start_date, end_date, status = campaign
-            db.execute(
-                """
-                INSERT INTO mailing_campaigns
-                (name, description, list_id, start_date, end_date, status)
-                VALUES (%s, %s, %s, %s, %s, %s)
-                """,
-                (name, description, list_id, start_date, end_date, status),
-            )
-        else:
-            # For SQLite, use the provided campaign_id (or NULL to auto-generate)
-            db.execute(
-                """
-                INSERT INTO mailing_campaigns
-                (campaign_id, name, description, list_id, start_date, end_date, status)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """,
-                campaign,
-            )
-
-        # Get campaign ID
-        result = db.query("SELECT campaign_id FROM mailing_campaigns WHERE name = %s", (f"Campaign {i+1}",))
-        campaign_id = result[0]["campaign_id"]
-        campaign_ids.append((campaign_id, list_id))
+    # Insert campaigns in one batch
+    sql, params = _insert_statement(db, "mailing_campaigns", campaigns)
+    results = _insert_returning(db, sql, params, "campaign_id, name")
+
+    # Match the returned campaign IDs back to the campaigns by name
+    ids_by_name = {row["name"]: row["campaign_id"] for row in results}
+    campaign_ids = [(ids_by_name[name], list_id) for _, name, _, list_id, _, _, _ in campaigns]
 
     return campaign_ids
 
@@ -453,57 +448,24 @@ def insert_mail_items(db: DatabaseInterface, campaign_data: List[Tuple[int, int]
     Returns:
         List of mail item IDs
     """
-    mail_item_ids = []
-
-    for campaign_id, list_id in campaign_data:
-        # Get members of this list
-        results = db.query("SELECT customer_id, address_id FROM list_members WHERE list_id = %s", (list_id,))
-
-        for row in results:
-            customer_id = row["customer_id"]
-            address_id = row["address_id"]
-
-            mail_item = (
-                None,
-                campaign_id,
-                customer_id,
-                address_id,
-                f"template_{campaign_id}",
-                "pending",
-            )
-
-            # Handle different database types
-            db_type = db.__class__.__name__
-
-            if db_type == "PostgreSQLInterface":
-                # For PostgreSQL, let the database generate the item_id
-                _, campaign_id, customer_id, address_id, content_template, status = mail_item
-                db.execute(
-                    """
-                    INSERT INTO mail_items
-                    (campaign_id, customer_id, address_id, content_template, status)
-                    VALUES (%s, %s, %s, %s, %s)
-                    """,
-                    (campaign_id, customer_id, address_id, content_template, status),
-                )
-            else:
-                # For SQLite, use the provided item_id (or NULL to auto-generate)
-                db.execute(
-                    """
-                    INSERT INTO mail_items
-                    (item_id, campaign_id, customer_id, address_id, content_template, status)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    """,
-                    mail_item,
-                )
-
-            # Get the inserted mail item ID
-            result = db.query(
-                "SELECT item_id FROM mail_items WHERE campaign_id = %s AND customer_id = %s AND address_id = %s",
-                (campaign_id, customer_id, address_id),
-            )
-            if result:
-                mail_item_ids.append(result[0]["item_id"])
+    # Get the members of every list in one query, grouped by list
+    members_by_list: Dict[int, List[Tuple[int, int]]] = {}
+    for row in db.query("SELECT list_id, customer_id, address_id FROM list_members"):
+        members_by_list.setdefault(row["list_id"], []).append((row["customer_id"], row["address_id"]))
+
+    mail_items = [
+        (None, campaign_id, customer_id, address_id, f"template_{campaign_id}", "pending")
+        for campaign_id, list_id in campaign_data
+        for customer_id, address_id in members_by_list.get(list_id, [])
+    ]
+
+    # Insert mail items in one batch
+    sql, params = _insert_statement(db, "mail_items", mail_items)
+    results = _insert_returning(db, sql, params, "item_id, campaign_id, customer_id, address_id")
+
+    # Match the returned mail item IDs back to the items by campaign and recipient
+    ids_by_key = {(row["campaign_id"], row["customer_id"], row["address_id"]): row["item_id"] for row in results}
+    mail_item_ids = [ids_by_key[mail_item[1:4]] for mail_item in mail_items]
 
     return mail_item_ids
 
@@ -539,35 +501,12 @@ def insert_print_jobs(db: DatabaseInterface) -> List[int]:
         ),
     ]
 
-    # Insert print jobs - handle different database types
-    db_type = db.__class__.__name__
-
-    for print_job in print_jobs:
-        if db_type == "PostgreSQLInterface":
-            # For PostgreSQL, let the database generate the job_id
-            _, name, description, status, scheduled_date, started_date, completed_date = print_job
-            db.execute(
-                """
-                INSERT INTO print_jobs
-                (name, description, status, scheduled_date, started_date, completed_date)
-                VALUES (%s, %s, %s, %s, %s, %s)
-                """,
-                (name, description, status, scheduled_date, started_date, completed_date),
-            )
-        else:
-            # For SQLite, use the provided job_id (or NULL to auto-generate)
-            db.execute(
-                """
-                INSERT INTO print_jobs
-                (job_id, name, description, status, scheduled_date, started_date, completed_date)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """,
-                print_job,
-            )
+    # Insert print jobs in one batch
+    sql, params = _insert_statement(db, "print_jobs", print_jobs)
+    results = _insert_returning(db, sql, params, "job_id")
 
     # Get print job IDs
-    results = db.query("SELECT job_id FROM print_jobs")
-    job_ids = [row["job_id"] for row in results]
+    job_ids = sorted(row["job_id"] for row in results)
     return job_ids
 
 
@@ -580,40 +519,19 @@ def insert_print_queue(db: DatabaseInterface, job_ids: List[int], mail_item_ids:
         job_ids: List of print job IDs
         mail_item_ids: List of mail item IDs
     """
-    for i, item_id in enumerate(mail_item_ids):
-        # Assign items to print jobs
-        job_id = job_ids[i % len(job_ids)]
-
-        queue_item = (
+    # Assign items to print jobs
+    queue_items = [
+        (
             None,
-            job_id,
+            job_ids[i % len(job_ids)],
             item_id,
             i + 1,  # print_order
             "queued",
             None,  # printed_at
         )
+        for i, item_id in enumerate(mail_item_ids)
+    ]
 
-        # Handle different database types
-        db_type = db.__class__.__name__
-
-        if db_type == "PostgreSQLInterface":
-            # For PostgreSQL, let the database generate the queue_id
-            _, job_id, item_id, print_order, status, printed_at = queue_item
-            db.execute(
-                """
-                INSERT INTO print_queue
-                (job_id, item_id, print_order, status, printed_at)
-                VALUES (%s, %s, %s, %s, %s)
-                """,
-                (job_id, item_id, print_order, status, printed_at),
-            )
-        else:
-            # For SQLite, use the provided queue_id (or NULL to auto-generate)
-            db.execute(
-                """
-                INSERT INTO print_queue
-                (queue_id, job_id, item_id, print_order, status, printed_at)
-                VALUES (%s, %s, %s, %s, %s, %s)
-                """,
-                queue_item,
-            )
+    # Insert the print queue in one batch
+    sql, params = _insert_statement(db, "print_queue", queue_items)
+    db.execute_many(sql, params)
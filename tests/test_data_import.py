@@ -15,10 +15,7 @@ def test_connection_creation(db_connection):
     assert isinstance(db_connection, sqlite3.Connection)
 
     # Verify foreign keys are enabled
-    cursor = db_connection.cursor()
-    cursor.execute("PRAGMA foreign_keys")
-    result = cursor.fetchone()
-    cursor.close()
+    result = db_connection.execute("PRAGMA foreign_keys").fetchone()
 
     assert result[0] == 1
 
@@ -26,10 +23,8 @@ def test_connection_creation(db_connection):
 def test_tables_exist(db_connection):
     """Test that all expected tables are created in the database."""
     # Get list of all tables
-    cursor = db_connection.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")
-    tables = [row[0] for row in cursor.fetchall()]
-    cursor.close()
+    rows = db_connection.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")
+    tables = [row[0] for row in rows]
 
     # Check for expected tables
     expected_tables = [
@@ -50,18 +45,15 @@ def test_tables_exist(db_connection):
         assert table in tables, f"Table {table} not found in database"
 
 
-def test_sample_data_import(db_with_sample_data):
+def test_sample_data_import(sample_data_readonly):
     """Test that sample data is imported correctly."""
     # Check customer count
-    cursor = db_with_sample_data.cursor()
-    cursor.execute("SELECT COUNT(*) FROM customers")
-    count = cursor.fetchone()[0]
-    cursor.close()
+    count = sample_data_readonly.execute("SELECT COUNT(*) FROM customers").fetchone()[0]
 
     assert count == 5, "Expected 5 customers in sample data"
 
     # Check that customers have the expected structure
-    result = execute_query(db_with_sample_data, "SELECT * FROM customers LIMIT 1")
+    result = execute_query(sample_data_readonly, "SELECT * FROM customers LIMIT 1")
 
     assert len(result) == 1, "Expected to find at least one customer"
 
@@ -73,14 +65,27 @@ def test_sample_data_import(db_with_sample_data):
     assert "@" in customer["email"], "Email should be in valid format"
 
     # Check that email addresses are unique
-    cursor = db_with_sample_data.cursor()
-    cursor.execute("SELECT COUNT(DISTINCT email) FROM customers")
-    unique_emails = cursor.fetchone()[0]
-    cursor.close()
+    unique_emails = sample_data_readonly.execute("SELECT COUNT(DISTINCT email) FROM customers").fetchone()[0]
 
     assert unique_emails == count, "All customer emails should be unique"
 
 
+def test_sample_data_is_isolated_per_test(db_with_sample_data, sample_data_readonly):
+    """Test that changes to the sample data do not leak into the shared sample database."""
+    # Delete all mail activity and customers in the per-test copy
+    db_with_sample_data.executescript(
+        "DELETE FROM delivery_tracking; DELETE FROM print_queue; DELETE FROM mail_items; "
+        "DELETE FROM list_members; DELETE FROM addresses; DELETE FROM customers;"
+    )
+
+    count = db_with_sample_data.execute("SELECT COUNT(*) FROM customers").fetchone()[0]
+    assert count == 0, "Customers should be deleted from the test database"
+
+    # The shared sample database, which later tests start from, still has the sample data
+    count = sample_data_readonly.execute("SELECT COUNT(*) FROM customers").fetchone()[0]
+    assert count == 5, "Shared sample data should keep its 5 customers"
+
+
 def test_foreign_key_constraints(db_with_sample_data):
     """Test that foreign key constraints are enforced."""
     # Make sure foreign keys are enabled
@@ -118,22 +123,18 @@ def test_import_from_json(db_connection, tmp_path):
     with open(json_file, "w") as f:
         json.dump(customers_data, f)
 
-    # Import the data
-    cursor = db_connection.cursor()
-
-    # Read JSON file
-    with open(json_file, "r") as f:
-        data = json.load(f)
-
-    # Insert data
-    for customer in data:
-        cursor.execute(
-            "INSERT INTO customers (name, email, phone) VALUES (?, ?, ?)",
-            (customer["name"], customer["email"], customer["phone"]),
-        )
+    # Import the data, inserting every customer in one statement and letting
+    # json_each() unpack the file's array
+    db_connection.execute(
+        """
+    INSERT INTO customers (name, email, phone)
+    SELECT json_extract(value, '$.name'), json_extract(value, '$.email'), json_extract(value, '$.phone')
+    FROM json_each(?)
+    """,
+        (json_file.read_text(),),
+    )
 
     db_connection.commit()
-    cursor.close()
 
     # Verify the data was imported
     result = execute_query(db_connection, "SELECT * FROM customers")
@@ -143,7 +144,7 @@ def test_import_from_json(db_connection, tmp_path):
     assert result[1]["email"] == "test2@example.com"
 
 
-def test_multiple_table_relationships(db_with_sample_data):
+def test_multiple_table_relationships(sample_data_readonly):
     """Test relationships between multiple tables."""
     # First, find a campaign ID that has mail items
     query_campaign = """
@@ -154,21 +155,21 @@ def test_multiple_table_relationships(db_with_sample_data):
     LIMIT 1
     """
 
-    campaign_results = execute_query(db_with_sample_data, query_campaign)
+    campaign_results = execute_query(sample_data_readonly, query_campaign)
     assert len(campaign_results) > 0, "Should have at least one campaign with mail items"
 
     campaign_id = campaign_results[0]["campaign_id"]
 
     # Query to join customers, addresses, and mail_items
-    query = f"""
+    query = """
     SELECT c.name, a.city, a.state, mi.content_template
     FROM mail_items mi
     JOIN customers c ON mi.customer_id = c.customer_id
     JOIN addresses a ON mi.address_id = a.address_id
-    WHERE mi.campaign_id = {campaign_id}
+    WHERE mi.campaign_id = ?
     """
 
-    results = execute_query(db_with_sample_data, query)
+    results = execute_query(sample_data_readonly, query, (campaign_id,))
 
     # Verify we have results
     assert len(results) > 0, f"Expected mail items for campaign {campaign_id}"
@@ -5,6 +5,27 @@ Tests for SQLite user-defined functions and triggers.
 
 from src.database.connection import execute_query
 
+# Expected (prefix, suffix) of each carrier's tracking numbers; other carriers
+# get "TRK" and the first two letters of their name
+_TRACKING_FORMATS = {
+    "USPS": ("USPS", "US"),
+    "UPS": ("1Z", "UP"),
+    "FEDEX": ("FDX", "FX"),
+}
+
+# SQL function script for test_sql_function_file, kept in memory rather than
+# written to and read back from a temporary file
+_SHIPPING_COST_SQL = """
+-- Calculate shipping cost based on weight and distance
+SELECT
+    CASE
+        WHEN :weight <= 1.0 THEN
+            5.00 + (:distance * 0.1)
+        ELSE
+            5.00 + (:weight * 2.0) + (:distance * 0.1)
+    END AS shipping_cost;
+"""
+
 
 def test_register_functions(db_connection):
     """Test that custom functions are registered with SQLite."""
@@ -29,12 +50,20 @@ def test_calculate_postage_function(db_connection):
         (2.0, 5, 1.05),  # 2.0 oz, Zone 5
     ]
 
-    for weight, zone, expected in test_cases:
-        result = execute_query(db_connection, "SELECT calculate_postage(?, ?) AS postage", (weight, zone))
+    # Price every case in one query, one row per (weight, zone) pair
+    placeholders = ", ".join(["(?, ?)"] * len(test_cases))
+    results = execute_query(
+        db_connection,
+        f"WITH cases(weight, zone) AS (VALUES {placeholders}) "
+        "SELECT calculate_postage(weight, zone) AS postage FROM cases",
+        tuple(value for weight, zone, _ in test_cases for value in (weight, zone)),
+    )
+    assert len(results) == len(test_cases)
 
+    for (weight, zone, expected), result in zip(test_cases, results):
         # Allow for small floating-point differences
         assert (
-            abs(result[0]["postage"] - expected) < 0.001
+            abs(result["postage"] - expected) < 0.001
         ), f"Postage for {weight} oz to Zone {zone} should be close to {expected}"
 
 
@@ -63,10 +92,18 @@ def test_validate_address_function(db_connection):
         ),
     ]
 
-    for address_json, expected in test_cases:
-        result = execute_query(db_connection, "SELECT validate_address(?) AS is_valid", (address_json,))
+    # Validate every address in one query, one row per case
+    placeholders = ", ".join(["(?)"] * len(test_cases))
+    results = execute_query(
+        db_connection,
+        f"WITH cases(address_json) AS (VALUES {placeholders}) "
+        "SELECT validate_address(address_json) AS is_valid FROM cases",
+        tuple(address_json for address_json, _ in test_cases),
+    )
+    assert len(results) == len(test_cases)
 
-        assert result[0]["is_valid"] == expected, f"Address validation for {address_json} should return {expected}"
+    for (address_json, expected), result in zip(test_cases, results):
+        assert result["is_valid"] == expected, f"Address validation for {address_json} should return {expected}"
 
 
 def test_generate_tracking_function(db_connection):
@@ -74,24 +111,24 @@ def test_generate_tracking_function(db_connection):
     # Test with different carriers
     carriers = ["USPS", "UPS", "FEDEX", "DHL"]
 
-    for carrier in carriers:
-        result = execute_query(db_connection, "SELECT generate_tracking(?) AS tracking", (carrier,))
+    # Generate a tracking number for every carrier in one query
+    placeholders = ", ".join(["(?)"] * len(carriers))
+    results = execute_query(
+        db_connection,
+        f"WITH cases(carrier) AS (VALUES {placeholders}) "
+        "SELECT carrier, generate_tracking(carrier) AS tracking FROM cases",
+        tuple(carriers),
+    )
+    assert [result["carrier"] for result in results] == carriers
 
-        tracking = result[0]["tracking"]
+    for result in results:
+        carrier = result["carrier"]
+        tracking = result["tracking"]
 
-        # Verify the tracking number format
-        if carrier == "USPS":
-            assert tracking.startswith("USPS"), "USPS tracking should start with USPS"
-            assert tracking.endswith("US"), "USPS tracking should end with US"
-        elif carrier == "UPS":
-            assert tracking.startswith("1Z"), "UPS tracking should start with 1Z"
-            assert tracking.endswith("UP"), "UPS tracking should end with UP"
-        elif carrier == "FEDEX":
-            assert tracking.startswith("FDX"), "FedEx tracking should start with FDX"
-            assert tracking.endswith("FX"), "FedEx tracking should end with FX"
-        else:
-            assert tracking.startswith("TRK"), "Generic tracking should start with TRK"
-            assert tracking.endswith(carrier.upper()[:2]), f"Generic tracking should end with {carrier.upper()[:2]}"
+        # Verify the tracking number format, falling back to the generic format
+        prefix, suffix = _TRACKING_FORMATS.get(carrier, ("TRK", carrier.upper()[:2]))
+        assert tracking.startswith(prefix), f"{carrier} tracking should start with {prefix}"
+        assert tracking.endswith(suffix), f"{carrier} tracking should end with {suffix}"
 
 
 def test_batch_counter_aggregate(db_connection):
@@ -100,7 +137,7 @@ def test_batch_counter_aggregate(db_connection):
     db_connection.execute("CREATE TABLE test_batch (id INTEGER PRIMARY KEY, value TEXT)")
     db_connection.executemany(
         "INSERT INTO test_batch (value) VALUES (?)",
-        [("Item 1",), ("Item 2",), (None,), ("",), ("Item 3",)],
+        [("Item 1",), ("Item 2",), (None,), ("",), ("   ",), ("\t",), ("\n ",), ("Item 3",)],
     )
 
     # Test the aggregate function
@@ -109,6 +146,27 @@ def test_batch_counter_aggregate(db_connection):
     # Should count only non-empty values
     assert result[0]["count"] == 3, "BatchCounter should count 3 non-empty values"
 
+    # On text values it matches the built-in count, which needs no Python call per row
+    native = execute_query(
+        db_connection,
+        "SELECT count(NULLIF(trim(value, ' ' || char(9, 10, 11, 12, 13)), '')) AS count FROM test_batch",
+    )
+    assert native[0]["count"] == result[0]["count"], "Built-in count should agree with BatchCounter on text"
+
+
+def test_sample_data_has_triggers(sample_data_readonly):
+    """Test that the triggers survive sample data generation."""
+    result = execute_query(
+        sample_data_readonly,
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' ORDER BY name",
+    )
+
+    assert [row["name"] for row in result] == [
+        "update_address_timestamp",
+        "update_customer_timestamp",
+        "update_print_job_status",
+    ], "Sample data database should have all triggers"
+
 
 def test_triggers(db_with_sample_data):
     """Test database triggers."""
@@ -173,54 +231,35 @@ def test_print_job_completion_trigger(db_with_sample_data):
     # Verify job status
     result = execute_query(
         db_with_sample_data,
-        f"SELECT status, completed_date FROM print_jobs WHERE job_id = {job_id}",
+        "SELECT status, completed_date FROM print_jobs WHERE job_id = ?",
+        (job_id,),
     )
     assert result[0]["status"] == "queued", "Job status should be queued"
     assert result[0]["completed_date"] is None, "Completed date should be NULL initially"
 
     # Update all queue items to completed
     db_with_sample_data.execute(
-        f"UPDATE print_queue SET status = 'completed', printed_at = CURRENT_TIMESTAMP WHERE job_id = {job_id}"
+        "UPDATE print_queue SET status = 'completed', printed_at = CURRENT_TIMESTAMP WHERE job_id = ?",
+        (job_id,),
     )
     db_with_sample_data.commit()
 
     # Verify job status was updated by trigger
     result = execute_query(
         db_with_sample_data,
-        f"SELECT status, completed_date FROM print_jobs WHERE job_id = {job_id}",
+        "SELECT status, completed_date FROM print_jobs WHERE job_id = ?",
+        (job_id,),
     )
     assert result[0]["status"] == "completed", "Job status should be updated to completed"
     assert result[0]["completed_date"] is not None, "Completed date should be set"
 
 
-def test_sql_function_file(db_connection, tmp_path):
-    """Test executing a SQL function from a file."""
-    # Create a temporary SQL function file
-    sql_file = tmp_path / "test_function.sql"
-    with open(sql_file, "w") as f:
-        f.write(
-            """
-        -- Calculate shipping cost based on weight and distance
-        SELECT
-            CASE
-                WHEN :weight <= 1.0 THEN
-                    5.00 + (:distance * 0.1)
-                ELSE
-                    5.00 + (:weight * 2.0) + (:distance * 0.1)
-            END AS shipping_cost;
-        """
-        )
-
+def test_sql_function_file(db_connection):
+    """Test executing a SQL function script with named parameters."""
     # Execute the SQL function
     db_connection.execute("BEGIN TRANSACTION")
 
-    with open(sql_file, "r") as f:
-        sql = f.read()
-
-    cursor = db_connection.cursor()
-    cursor.execute(sql, {"weight": 2.5, "distance": 100})
-    result = cursor.fetchone()
-    cursor.close()
+    result = db_connection.execute(_SHIPPING_COST_SQL, {"weight": 2.5, "distance": 100}).fetchone()
 
     db_connection.rollback()  # No need to commit
 
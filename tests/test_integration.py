@@ -1,9 +1,10 @@
 """
 Integration tests for SQLite database operations.
 """
-
+import sqlite3
 
 from src.database.connection import execute_query
+from src.database.schema_manager import FOREIGN_KEY_INDEXES
 
 
 def test_end_to_end_mailing_process(db_with_sample_data):
@@ -11,6 +12,9 @@ def test_end_to_end_mailing_process(db_with_sample_data):
     Test the entire mailing process from campaign creation to delivery tracking.
     This tests interactions between multiple tables and operations.
     """
+    # Run every step in one transaction, taking the write lock up front
+    db_with_sample_data.execute("BEGIN IMMEDIATE")
+
     # 1. Create a new campaign
     db_with_sample_data.execute(
         """
@@ -101,42 +105,40 @@ def test_end_to_end_mailing_process(db_with_sample_data):
     # Commit all changes
     db_with_sample_data.commit()
 
-    # Verify the end-to-end process
-    # 1. Check that mail items were created
+    # Verify the end-to-end process, reading every check back in one query
     result = execute_query(
         db_with_sample_data,
-        "SELECT COUNT(*) AS count FROM mail_items WHERE campaign_id = ?",
-        (campaign_id,),
+        """
+    SELECT
+        (SELECT COUNT(*) FROM mail_items WHERE campaign_id = ?) AS mail_item_count,
+        (SELECT COUNT(*) FROM print_queue WHERE job_id = ?) AS queue_count,
+        pj.status AS job_status,
+        pj.completed_date AS job_completed_date,
+        (
+            SELECT COUNT(*)
+            FROM delivery_tracking
+            WHERE item_id IN (SELECT item_id FROM mail_items WHERE campaign_id = ?)
+        ) AS tracking_count
+    FROM print_jobs pj
+    WHERE pj.job_id = ?
+    """,
+        (campaign_id, job_id, campaign_id, job_id),
     )
-    mail_item_count = result[0]["count"]
+    checks = result[0]
+
+    # 1. Check that mail items were created
+    mail_item_count = checks["mail_item_count"]
     assert mail_item_count > 0, "Mail items should be created for the campaign"
 
     # 2. Check that print queue entries were created
-    result = execute_query(
-        db_with_sample_data,
-        "SELECT COUNT(*) AS count FROM print_queue WHERE job_id = ?",
-        (job_id,),
-    )
-    queue_count = result[0]["count"]
-    assert queue_count == mail_item_count, "Print queue should have entries for all mail items"
+    assert checks["queue_count"] == mail_item_count, "Print queue should have entries for all mail items"
 
     # 3. Check that the print job was marked as completed
-    result = execute_query(
-        db_with_sample_data,
-        "SELECT status, completed_date FROM print_jobs WHERE job_id = ?",
-        (job_id,),
-    )
-    assert result[0]["status"] == "completed", "Print job should be marked as completed"
-    assert result[0]["completed_date"] is not None, "Completed date should be set"
+    assert checks["job_status"] == "completed", "Print job should be marked as completed"
+    assert checks["job_completed_date"] is not None, "Completed date should be set"
 
     # 4. Check that tracking entries were created
-    result = execute_query(
-        db_with_sample_data,
-        "SELECT COUNT(*) AS count FROM delivery_tracking WHERE item_id IN (SELECT item_id FROM mail_items WHERE campaign_id = ?)",
-        (campaign_id,),
-    )
-    tracking_count = result[0]["count"]
-    assert tracking_count == mail_item_count, "Tracking entries should exist for all mail items"
+    assert checks["tracking_count"] == mail_item_count, "Tracking entries should exist for all mail items"
 
 
 def test_complex_query_performance(db_with_sample_data):
@@ -169,17 +171,18 @@ def test_complex_query_performance(db_with_sample_data):
         a.state,
         COUNT(mi.item_id) AS total_mailings,
         SUM(calculate_postage(0.5, 3)) AS total_postage,
-        (
-            SELECT COUNT(*)
-            FROM delivery_tracking dt
-            JOIN mail_items mi2 ON dt.item_id = mi2.item_id
-            WHERE mi2.customer_id = c.customer_id
-            AND dt.status IN ('pending', 'shipped', 'delivered')
-        ) AS shipped_count
+        COALESCE(s.shipped_count, 0) AS shipped_count
     FROM customers c
     JOIN addresses a ON c.customer_id = a.customer_id
     JOIN mail_items mi ON c.customer_id = mi.customer_id AND mi.address_id = a.address_id
     JOIN mailing_campaigns mc ON mi.campaign_id = mc.campaign_id
+    LEFT JOIN (
+        SELECT mi2.customer_id, COUNT(*) AS shipped_count
+        FROM delivery_tracking dt
+        JOIN mail_items mi2 ON dt.item_id = mi2.item_id
+        WHERE dt.status IN ('pending', 'shipped', 'delivered')
+        GROUP BY mi2.customer_id
+    ) s ON s.customer_id = c.customer_id
     WHERE mc.status = 'active'
     GROUP BY c.customer_id, a.address_id
     ORDER BY total_mailings DESC
@@ -208,16 +211,28 @@ def test_complex_query_performance(db_with_sample_data):
         assert result["total_postage"] > 0, "Postage calculation should return positive values"
 
 
+def _customer_and_address_counts(conn: sqlite3.Connection) -> tuple[int, int]:
+    """Count the customers and addresses with a single query.
+
+    Args:
+        conn: SQLite database connection
+
+    Returns:
+        Tuple of (customer count, address count)
+    """
+    result = execute_query(
+        conn,
+        "SELECT (SELECT COUNT(*) FROM customers) AS customers, (SELECT COUNT(*) FROM addresses) AS addresses",
+    )
+    return result[0]["customers"], result[0]["addresses"]
+
+
 def test_transaction_rollback(db_with_sample_data):
     """
     Test that transactions can be rolled back to maintain data integrity.
     """
     # Get initial counts
-    result = execute_query(db_with_sample_data, "SELECT COUNT(*) AS count FROM customers")
-    initial_customer_count = result[0]["count"]
-
-    result = execute_query(db_with_sample_data, "SELECT COUNT(*) AS count FROM addresses")
-    initial_address_count = result[0]["count"]
+    initial_customer_count, initial_address_count = _customer_and_address_counts(db_with_sample_data)
 
     # Start a transaction
     db_with_sample_data.execute("BEGIN TRANSACTION")
@@ -247,24 +262,20 @@ def test_transaction_rollback(db_with_sample_data):
     )
 
     # Verify the data was inserted
-    result = execute_query(db_with_sample_data, "SELECT COUNT(*) AS count FROM customers")
-    assert result[0]["count"] == initial_customer_count + 1, "Customer should be inserted"
-
-    result = execute_query(db_with_sample_data, "SELECT COUNT(*) AS count FROM addresses")
-    assert result[0]["count"] == initial_address_count + 1, "Address should be inserted"
+    customer_count, address_count = _customer_and_address_counts(db_with_sample_data)
+    assert customer_count == initial_customer_count + 1, "Customer should be inserted"
+    assert address_count == initial_address_count + 1, "Address should be inserted"
 
     # Rollback the transaction
     db_with_sample_data.rollback()
 
     # Verify the data was rolled back
-    result = execute_query(db_with_sample_data, "SELECT COUNT(*) AS count FROM customers")
-    assert result[0]["count"] == initial_customer_count, "Customer insert should be rolled back"
+    customer_count, address_count = _customer_and_address_counts(db_with_sample_data)
+    assert customer_count == initial_customer_count, "Customer insert should be rolled back"
+    assert address_count == initial_address_count, "Address insert should be rolled back"
 
-    result = execute_query(db_with_sample_data, "SELECT COUNT(*) AS count FROM addresses")
-    assert result[0]["count"] == initial_address_count, "Address insert should be rolled back"
 
-
-def test_database_consistency(db_with_sample_data):
+def test_database_consistency(sample_data_readonly):
     """
     Test database consistency by checking referential integrity.
     """
@@ -284,16 +295,31 @@ def test_database_consistency(db_with_sample_data):
         ("delivery_tracking", "item_id", "mail_items", "item_id"),
     ]
 
-    for child_table, fk_column, parent_table, pk_column in tables_with_fks:
-        # Check that all foreign keys reference existing primary keys
-        query = f"""
-        SELECT COUNT(*) AS invalid_count
-        FROM {child_table} c
-        LEFT JOIN {parent_table} p ON c.{fk_column} = p.{pk_column}
-        WHERE p.{pk_column} IS NULL
-        """
+    # Every relationship should be declared as a foreign key constraint...
+    query = """
+    SELECT m.name AS child_table, f."from" AS fk_column, f."table" AS parent_table, f."to" AS pk_column
+    FROM sqlite_master m, pragma_foreign_key_list(m.name) f
+    WHERE m.type = 'table'
+    """
+    declared = {
+        (row["child_table"], row["fk_column"], row["parent_table"], row["pk_column"])
+        for row in execute_query(sample_data_readonly, query)
+    }
+    missing = set(tables_with_fks) - declared
+    assert not missing, f"Expected foreign key constraints for {sorted(missing)}"
+
+    # ...so SQLite can check every one of them in a single pass
+    violations = execute_query(sample_data_readonly, "PRAGMA foreign_key_check")
+    assert not violations, "All foreign keys should reference valid rows, but found: " + ", ".join(
+        f"{row['table']} row {row['rowid']} -> {row['parent']}" for row in violations
+    )
+
+
+def test_schema_file_indexes_match_foreign_key_indexes(db_with_schema, db_connection):
+    """Test that the SQL schema file and create_tables() build the same foreign key indexes."""
+    expected = {(index_name, table) for index_name, table, _ in FOREIGN_KEY_INDEXES}
+    query = "SELECT name, tbl_name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'"
 
-        result = execute_query(db_with_sample_data, query)
-        assert (
-            result[0]["invalid_count"] == 0
-        ), f"All {fk_column} in {child_table} should reference valid {pk_column} in {parent_table}"
+    # initial_schema.sql is written by hand, create_tables() builds its indexes from FOREIGN_KEY_INDEXES
+    for conn in (db_with_schema, db_connection):
+        assert {tuple(row) for row in conn.execute(query)} == expected, "Foreign key indexes should match"
@@ -1,20 +1,51 @@
 """
 Tests for database migrations.
 """
-from pathlib import Path
+import json
+import sqlite3
+
+import pytest
 
 from src.database.connection import execute_query
-from src.migrations.data_migrations import DataMigration, transform_addresses
+from src.migrations.data_migrations import DataMigration, import_data_from_json, transform_addresses
 from src.migrations.schema_migrations import SchemaMigration, add_column, create_index, rename_table
 
 
+def _table_columns(conn: sqlite3.Connection, table: str) -> list[str]:
+    """Return the names of a table's columns.
+
+    Binding the table name to pragma_table_info() keeps the statement text
+    constant, so every lookup reuses one prepared statement.
+
+    Args:
+        conn: SQLite database connection
+        table: Name of the table
+
+    Returns:
+        List of column names, in table order
+    """
+    return [row[0] for row in conn.execute("SELECT name FROM pragma_table_info(?) ORDER BY cid", (table,))]
+
+
+def _schema_object_exists(conn: sqlite3.Connection, object_type: str, name: str) -> bool:
+    """Check whether a table, index or other schema object exists.
+
+    Args:
+        conn: SQLite database connection
+        object_type: Type of the object, e.g. 'table' or 'index'
+        name: Name of the object
+
+    Returns:
+        True if the object exists
+    """
+    cursor = conn.execute("SELECT 1 FROM sqlite_master WHERE type = ? AND name = ?", (object_type, name))
+    return cursor.fetchone() is not None
+
+
 def test_add_column_migration(migration_db):
     """Test adding a column to an existing table."""
     # Verify the column doesn't exist yet
-    cursor = migration_db.cursor()
-    cursor.execute("PRAGMA table_info(customers)")
-    columns = [row[1] for row in cursor.fetchall()]
-    cursor.close()
+    columns = _table_columns(migration_db, "customers")
 
     assert "contact_preference" not in columns, "Column should not exist before migration"
 
@@ -22,10 +53,7 @@ def test_add_column_migration(migration_db):
     add_column(migration_db, "customers", "contact_preference", "TEXT DEFAULT 'email'")
 
     # Verify the column was added
-    cursor = migration_db.cursor()
-    cursor.execute("PRAGMA table_info(customers)")
-    columns = [row[1] for row in cursor.fetchall()]
-    cursor.close()
+    columns = _table_columns(migration_db, "customers")
 
     assert "contact_preference" in columns, "Column should exist after migration"
 
@@ -37,10 +65,7 @@ def test_add_column_migration(migration_db):
 def test_rename_table_migration(migration_db):
     """Test renaming a table."""
     # Verify the original table exists
-    cursor = migration_db.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='mailing_lists'")
-    exists = cursor.fetchone() is not None
-    cursor.close()
+    exists = _schema_object_exists(migration_db, "table", "mailing_lists")
 
     assert exists, "Original table should exist before migration"
 
@@ -48,13 +73,8 @@ def test_rename_table_migration(migration_db):
     rename_table(migration_db, "mailing_lists", "contact_lists")
 
     # Verify the table was renamed
-    cursor = migration_db.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='contact_lists'")
-    new_exists = cursor.fetchone() is not None
-
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='mailing_lists'")
-    old_exists = cursor.fetchone() is not None
-    cursor.close()
+    new_exists = _schema_object_exists(migration_db, "table", "contact_lists")
+    old_exists = _schema_object_exists(migration_db, "table", "mailing_lists")
 
     assert new_exists, "New table name should exist after migration"
     assert not old_exists, "Old table name should not exist after migration"
@@ -63,10 +83,7 @@ def test_rename_table_migration(migration_db):
 def test_create_index_migration(migration_db):
     """Test creating an index on a table."""
     # Verify the index doesn't exist yet
-    cursor = migration_db.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND name='idx_customers_name'")
-    exists = cursor.fetchone() is not None
-    cursor.close()
+    exists = _schema_object_exists(migration_db, "index", "idx_customers_name")
 
     assert not exists, "Index should not exist before migration"
 
@@ -74,10 +91,7 @@ def test_create_index_migration(migration_db):
     create_index(migration_db, "customers", ["name"])
 
     # Verify the index was created
-    cursor = migration_db.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND name='idx_customers_name'")
-    exists = cursor.fetchone() is not None
-    cursor.close()
+    exists = _schema_object_exists(migration_db, "index", "idx_customers_name")
 
     assert exists, "Index should exist after migration"
 
@@ -88,23 +102,15 @@ def test_schema_migration_tracking(migration_db):
     migration_manager = SchemaMigration(migration_db)
 
     # Verify the migrations table exists
-    cursor = migration_db.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='schema_migrations'")
-    exists = cursor.fetchone() is not None
-    cursor.close()
+    exists = _schema_object_exists(migration_db, "table", "schema_migrations")
 
     assert exists, "Migrations table should be created"
 
-    # Create a temporary migration file
-    tmp_dir = Path("./tmp_migrations")
-    tmp_dir.mkdir(exist_ok=True)
-
-    migration_file = tmp_dir / "001_test_migration.sql"
-    with open(migration_file, "w") as f:
-        f.write("ALTER TABLE customers ADD COLUMN test_column TEXT;")
+    # Pass the migration as a string; test_sql_migration_file covers files
+    migration = ("001_test_migration", "ALTER TABLE customers ADD COLUMN test_column TEXT;")
 
     # Apply the migration
-    result = migration_manager.apply_migration(migration_file, "Test migration")
+    result = migration_manager.apply_migration(migration, "Test migration")
 
     # Verify the migration was applied
     assert result, "Migration should be applied successfully"
@@ -114,14 +120,18 @@ def test_schema_migration_tracking(migration_db):
     assert "001_test_migration" in applied, "Migration should be recorded"
 
     # Try to apply the same migration again
-    result = migration_manager.apply_migration(migration_file)
+    result = migration_manager.apply_migration(migration)
 
     # Verify the migration was not applied again
     assert not result, "Migration should not be applied twice"
 
-    # Clean up
-    migration_file.unlink()
-    tmp_dir.rmdir()
+    # A migration applied without a description gets a default one
+    migration_manager.apply_migration(("002_test_migration", "ALTER TABLE customers ADD COLUMN other_column TEXT;"))
+    descriptions = dict(migration_db.execute("SELECT migration_id, description FROM schema_migrations"))
+    assert descriptions == {
+        "001_test_migration": "Test migration",
+        "002_test_migration": "Applied migration 002_test_migration",
+    }, "Each migration should be recorded with its description"
 
 
 def test_data_migration(migration_db):
@@ -130,16 +140,19 @@ def test_data_migration(migration_db):
     migration_manager = DataMigration(migration_db)
 
     # Verify the data migrations table exists
-    cursor = migration_db.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='data_migrations'")
-    exists = cursor.fetchone() is not None
-    cursor.close()
+    exists = _schema_object_exists(migration_db, "table", "data_migrations")
 
     assert exists, "Data migrations table should be created"
 
     # Check initial state - states should be mixed case
-    results = execute_query(migration_db, "SELECT state FROM addresses")
-    assert any(r["state"] != r["state"].upper() for r in results), "States should be mixed case initially"
+    mixed_case_query = "SELECT COUNT(*) AS mixed FROM addresses WHERE state != UPPER(state)"
+    results = execute_query(migration_db, mixed_case_query)
+    assert results[0]["mixed"] > 0, "States should be mixed case initially"
+
+    # Pad one 9-digit postal code with a tab and a newline, which should be stripped
+    address_id = migration_db.execute("SELECT MIN(address_id) FROM addresses").fetchone()[0]
+    migration_db.execute("UPDATE addresses SET postal_code = ? WHERE address_id = ?", ("123456789\t\n", address_id))
+    migration_db.commit()
 
     # Apply the data migration
     result = migration_manager.apply_migration(
@@ -150,8 +163,12 @@ def test_data_migration(migration_db):
     assert result, "Migration should be applied successfully"
 
     # Verify the data was transformed
-    results = execute_query(migration_db, "SELECT state FROM addresses")
-    assert all(r["state"] == r["state"].upper() for r in results), "All states should be uppercase after migration"
+    results = execute_query(migration_db, mixed_case_query)
+    assert results[0]["mixed"] == 0, "All states should be uppercase after migration"
+    postal_code = migration_db.execute(
+        "SELECT postal_code FROM addresses WHERE address_id = ?", (address_id,)
+    ).fetchone()
+    assert postal_code[0] == "12345-6789", "Padded 9-digit postal codes should be formatted as ZIP+4"
 
     # Verify the migration was recorded
     applied = migration_manager.get_applied_migrations()
@@ -178,10 +195,7 @@ def test_sql_migration_file(migration_db, tmp_path):
     assert result, "Migration should be applied successfully"
 
     # Verify the column was added
-    cursor = migration_db.cursor()
-    cursor.execute("PRAGMA table_info(mail_items)")
-    columns = [row[1] for row in cursor.fetchall()]
-    cursor.close()
+    columns = _table_columns(migration_db, "mail_items")
 
     assert "priority" in columns, "Column should be added by the migration"
 
@@ -214,27 +228,116 @@ def test_multiple_migrations(migration_db, tmp_path):
     assert count == 3, "All three migrations should be applied"
 
     # Verify all columns were added
-    cursor = migration_db.cursor()
-
-    cursor.execute("PRAGMA table_info(customers)")
-    customer_columns = [row[1] for row in cursor.fetchall()]
-
-    cursor.execute("PRAGMA table_info(mail_items)")
-    mail_item_columns = [row[1] for row in cursor.fetchall()]
-
-    cursor.execute("PRAGMA table_info(print_jobs)")
-    print_job_columns = [row[1] for row in cursor.fetchall()]
-
-    cursor.close()
+    customer_columns = _table_columns(migration_db, "customers")
+    mail_item_columns = _table_columns(migration_db, "mail_items")
+    print_job_columns = _table_columns(migration_db, "print_jobs")
 
     assert "contact_preference" in customer_columns, "Customer column should be added"
     assert "priority" in mail_item_columns, "Mail item column should be added"
     assert "cost_center" in print_job_columns, "Print job column should be added"
 
     # Verify migrations were recorded in the correct order
-    applied = migration_manager.get_applied_migrations()
-    assert applied == [
+    results = execute_query(migration_db, "SELECT migration_id FROM schema_migrations ORDER BY id")
+    assert [r["migration_id"] for r in results] == [
         "001_add_contact_preference",
         "002_add_priority",
         "003_add_cost_center",
     ], "Migrations should be recorded in the correct order"
+    assert migration_manager.get_applied_migrations() == {
+        "001_add_contact_preference",
+        "002_add_priority",
+        "003_add_cost_center",
+    }, "All migrations should be reported as applied"
+
+
+def test_bulk_import_from_json(migration_db, tmp_path):
+    """Test that a bulk JSON import loads the data and restores the table's indexes."""
+    addresses = [
+        {
+            "customer_id": 1,
+            "address_type": "work",
+            "street_line1": f"{i} Bulk Ave",
+            "city": "Loadville",
+            "state": "OH",
+            "postal_code": f"{43000 + i}",
+        }
+        for i in range(10)
+    ]
+    json_file = tmp_path / "addresses.json"
+    with open(json_file, "w") as f:
+        json.dump(addresses, f)
+
+    index_query = "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='addresses' ORDER BY name"
+    indexes_before = [row["name"] for row in execute_query(migration_db, index_query)]
+
+    # Import the data with the index drop/recreate optimization
+    count = import_data_from_json(migration_db, json_file, "addresses", bulk=True)
+
+    assert count == 10, "All records should be imported"
+    result = execute_query(migration_db, "SELECT COUNT(*) AS count FROM addresses WHERE city = 'Loadville'")
+    assert result[0]["count"] == 10, "Imported rows should be in the table"
+
+    # Verify the indexes were recreated
+    indexes_after = [row["name"] for row in execute_query(migration_db, index_query)]
+    assert indexes_after == indexes_before, "Indexes should be recreated after the bulk import"
+
+
+def test_transform_addresses_postal_codes(migration_db):
+    """Test that the address transformation formats 9-digit postal codes as ZIP+4."""
+    migration_db.executemany(
+        "UPDATE addresses SET postal_code = ? WHERE address_id = ?",
+        [(" 123456789 ", 1), ("2345", 2)],
+    )
+
+    transform_addresses(migration_db)
+
+    results = execute_query(migration_db, "SELECT postal_code FROM addresses ORDER BY address_id")
+    assert results[0]["postal_code"] == "12345-6789", "9-digit postal codes should be formatted as ZIP+4"
+    assert results[1]["postal_code"] == "2345", "Other postal codes should only be trimmed"
+
+
+def test_failed_migration_keeps_earlier_migrations(migration_db, tmp_path):
+    """Test that a failing migration in a directory run only rolls back that migration."""
+    migration_dir = tmp_path / "migrations"
+    migration_dir.mkdir()
+
+    with open(migration_dir / "001_add_contact_preference.sql", "w") as f:
+        f.write("ALTER TABLE customers ADD COLUMN contact_preference TEXT DEFAULT 'email';")
+
+    # Second migration adds a column and then fails on a missing table
+    with open(migration_dir / "002_broken.sql", "w") as f:
+        f.write("ALTER TABLE mail_items ADD COLUMN priority TEXT;\nALTER TABLE missing_table ADD COLUMN x TEXT;")
+
+    migration_manager = SchemaMigration(migration_db)
+
+    with pytest.raises(RuntimeError, match="Migration failed"):
+        migration_manager.apply_migrations_from_directory(migration_dir)
+
+    # The first migration is kept, the failing one is rolled back completely
+    assert migration_manager.get_applied_migrations() == {"001_add_contact_preference"}
+
+    mail_item_columns = _table_columns(migration_db, "mail_items")
+
+    assert "priority" not in mail_item_columns, "Partial changes from the failed migration should be rolled back"
+
+
+def test_migration_with_statements_on_one_line(migration_db, tmp_path):
+    """Test migrations that put several statements, and their own transaction, on one line."""
+    migration_dir = tmp_path / "migrations"
+    migration_dir.mkdir()
+
+    with open(migration_dir / "001_add_columns.sql", "w") as f:
+        f.write("ALTER TABLE customers ADD COLUMN a TEXT; ALTER TABLE customers ADD COLUMN b TEXT;")
+
+    # The script's own BEGIN/COMMIT must not break the transaction it runs in
+    with open(migration_dir / "002_add_wrapped_column.sql", "w") as f:
+        f.write("BEGIN TRANSACTION; ALTER TABLE mail_items ADD COLUMN c TEXT; COMMIT;")
+
+    migration_manager = SchemaMigration(migration_db)
+
+    # Apply the first file on its own, and the rest of the directory after it
+    assert migration_manager.apply_migration(migration_dir / "001_add_columns.sql")
+    assert migration_manager.apply_migrations_from_directory(migration_dir) == 1
+
+    assert {"a", "b"} <= set(_table_columns(migration_db, "customers")), "Both columns should be added"
+    assert "c" in _table_columns(migration_db, "mail_items"), "Wrapped migration should be applied"
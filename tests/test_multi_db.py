@@ -4,6 +4,7 @@ Tests for multi-database functionality.
 This module contains tests that can be run against both SQLite and PostgreSQL
 databases to verify that the application works with both database types.
 """
+from src.database.schema_manager import TABLES, get_schema_manager
 
 
 def test_customer_creation(db_interface):
@@ -31,36 +32,25 @@ def test_customer_creation(db_interface):
 
 def test_address_creation(db_interface):
     """Test that addresses can be created in both database types."""
-    # Insert a new customer first
-    db_interface.execute(
-        "INSERT INTO customers (name, email, phone) VALUES (%s, %s, %s)",
-        ("Address Test", "address@example.com", "555-ADDR"),
-    )
-
-    # Get the customer ID
+    # Insert a new customer first, reading its ID back from the insert
     results = db_interface.query(
-        "SELECT customer_id FROM customers WHERE email = %s",
-        ("address@example.com",),
+        "INSERT INTO customers (name, email, phone) VALUES (%s, %s, %s) RETURNING customer_id",
+        ("Address Test", "address@example.com", "555-ADDR"),
     )
     customer_id = results[0]["customer_id"]
 
-    # Insert an address for the customer
-    db_interface.execute(
+    # Insert an address for the customer, reading the stored row back from the insert
+    results = db_interface.query(
         """
         INSERT INTO addresses
         (customer_id, address_type, street_line1, city, state, postal_code, country, is_verified)
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        RETURNING *
         """,
         (customer_id, "home", "123 Test St", "Testville", "OH", "12345", "USA", True),
     )
     db_interface.commit()
 
-    # Query for the address
-    results = db_interface.query(
-        "SELECT * FROM addresses WHERE customer_id = %s",
-        (customer_id,),
-    )
-
     # Verify the address was created
     assert len(results) == 1
     address = results[0]
@@ -76,46 +66,29 @@ def test_address_creation(db_interface):
 
 def test_relationship_integrity(db_interface):
     """Test that relationships work correctly in both database types."""
-    # Insert a customer
-    db_interface.execute(
-        "INSERT INTO customers (name, email, phone) VALUES (%s, %s, %s)",
-        ("Relationship Test", "relation@example.com", "555-REL"),
-    )
-
-    # Get the customer ID
+    # Insert a customer, reading its ID back from the insert
     results = db_interface.query(
-        "SELECT customer_id FROM customers WHERE email = %s",
-        ("relation@example.com",),
+        "INSERT INTO customers (name, email, phone) VALUES (%s, %s, %s) RETURNING customer_id",
+        ("Relationship Test", "relation@example.com", "555-REL"),
     )
     customer_id = results[0]["customer_id"]
 
     # Insert an address for the customer
-    db_interface.execute(
+    results = db_interface.query(
         """
         INSERT INTO addresses
         (customer_id, address_type, street_line1, city, state, postal_code, country, is_verified)
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        RETURNING address_id
         """,
         (customer_id, "home", "456 Relation St", "Relationville", "OH", "54321", "USA", True),
     )
-
-    # Get the address ID
-    results = db_interface.query(
-        "SELECT address_id FROM addresses WHERE customer_id = %s",
-        (customer_id,),
-    )
     address_id = results[0]["address_id"]
 
     # Insert a mailing list
-    db_interface.execute(
-        "INSERT INTO mailing_lists (name, description, created_by) VALUES (%s, %s, %s)",
-        ("Test List", "Test mailing list", "test_user"),
-    )
-
-    # Get the list ID
     results = db_interface.query(
-        "SELECT list_id FROM mailing_lists WHERE name = %s",
-        ("Test List",),
+        "INSERT INTO mailing_lists (name, description, created_by) VALUES (%s, %s, %s) RETURNING list_id",
+        ("Test List", "Test mailing list", "test_user"),
     )
     list_id = results[0]["list_id"]
 
@@ -155,36 +128,46 @@ def test_relationship_integrity(db_interface):
     assert member["list_name"] == "Test List"
 
 
+# Tables the sample data is expected to fill
+_SAMPLE_DATA_TABLES = (
+    "customers",
+    "addresses",
+    "mailing_lists",
+    "list_members",
+    "mailing_campaigns",
+    "mail_items",
+    "print_jobs",
+    "print_queue",
+)
+
+
 def test_sample_data(db_interface, sample_data):
     """Test that sample data is correctly inserted in both database types."""
-    # Query for customers
-    customer_results = db_interface.query("SELECT COUNT(*) as count FROM customers")
-    assert customer_results[0]["count"] > 0
+    # Count the rows in every table with one query
+    counts = ", ".join(f"(SELECT COUNT(*) FROM {table}) AS {table}" for table in _SAMPLE_DATA_TABLES)
+    results = db_interface.query(f"SELECT {counts}")[0]
 
-    # Query for addresses
-    address_results = db_interface.query("SELECT COUNT(*) as count FROM addresses")
-    assert address_results[0]["count"] > 0
+    # Verify each table has rows
+    for table in _SAMPLE_DATA_TABLES:
+        assert results[table] > 0, f"Table {table} should have sample data"
 
-    # Query for mailing lists
-    list_results = db_interface.query("SELECT COUNT(*) as count FROM mailing_lists")
-    assert list_results[0]["count"] > 0
 
-    # Query for list members
-    member_results = db_interface.query("SELECT COUNT(*) as count FROM list_members")
-    assert member_results[0]["count"] > 0
+def test_clear_tables(db_interface, sample_data):
+    """Test that clearing the tables removes all rows and keeps the schema."""
+    schema_manager = get_schema_manager(db_interface)
+    schema_manager.clear_tables()
 
-    # Query for campaigns
-    campaign_results = db_interface.query("SELECT COUNT(*) as count FROM mailing_campaigns")
-    assert campaign_results[0]["count"] > 0
+    # Verify every table is empty
+    for table in TABLES:
+        results = db_interface.query(f"SELECT COUNT(*) as count FROM {table}")
+        assert results[0]["count"] == 0, f"Table {table} should be empty"
 
-    # Query for mail items
-    item_results = db_interface.query("SELECT COUNT(*) as count FROM mail_items")
-    assert item_results[0]["count"] > 0
-
-    # Query for print jobs
-    job_results = db_interface.query("SELECT COUNT(*) as count FROM print_jobs")
-    assert job_results[0]["count"] > 0
+    # Verify the tables still accept new rows, with IDs starting over
+    db_interface.execute(
+        "INSERT INTO customers (name, email, phone) VALUES (%s, %s, %s)",
+        ("Test Customer", "test@example.com", "555-TEST"),
+    )
+    db_interface.commit()
 
-    # Query for print queue
-    queue_results = db_interface.query("SELECT COUNT(*) as count FROM print_queue")
-    assert queue_results[0]["count"] > 0
+    results = db_interface.query("SELECT customer_id FROM customers")
+    assert results[0]["customer_id"] == 1, "Customer IDs should restart after clearing"